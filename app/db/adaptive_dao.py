@@ -78,10 +78,22 @@ class AdaptiveDatabaseDAO:
             conn.close()
     
     @contextmanager
-    def get_cursor(self, dict_cursor=True):
+    def get_cursor(self, dict_cursor=True, name: Optional[str] = None, itersize: int = 2000,
+                   cursor_factory=None):
+        """
+        Cursor sobre una conexión nueva.
+        
+        Con name se abre un cursor de servidor (named cursor): al iterarlo Postgres
+        envía las filas en bloques de itersize en vez de todo el resultado de golpe.
+        cursor_factory reemplaza al RealDictCursor por defecto (por ejemplo
+        NamedTupleCursor para lecturas grandes sin un dict por fila).
+        """
         with self.get_connection() as conn:
-            cursor_factory = RealDictCursor if dict_cursor else None
-            cur = conn.cursor(cursor_factory=cursor_factory)
+            if cursor_factory is None:
+                cursor_factory = RealDictCursor if dict_cursor else None
+            cur = conn.cursor(name=name, cursor_factory=cursor_factory)
+            if name:
+                cur.itersize = itersize
             try:
                 yield cur
             finally:
@@ -416,6 +428,57 @@ class AdaptiveDatabaseDAO:
             logger.error(f"Connection test failed: {e}")
             return False
     
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        """Indica si la columna existe según el schema descubierto."""
+        return column_name in self.table_schemas.get(table_name, {}).get('column_names', [])
+    
+    def ensure_detected_date_column(self) -> bool:
+        """
+        Crea submissions.detected_date (fecha UTC de detected_at, columna generada)
+        y un índice BRIN sobre ella si todavía no existen.
+        
+        BRIN ocupa muy poco y encaja con submissions, que crece por fecha de detección.
+        
+        Solo se aplica si detected_at es timestamptz: sobre un timestamp sin zona,
+        AT TIME ZONE 'UTC' significa otra cosa y la expresión no es inmutable, así
+        que la columna generada no se puede crear.
+        
+        Returns:
+            bool: True si se creó la columna
+        """
+        if self.has_column('submissions', 'detected_date'):
+            return False
+        
+        with self.get_cursor() as cur:
+            cur.execute("""
+                SELECT data_type
+                FROM information_schema.columns
+                WHERE table_schema = 'public'
+                AND table_name = 'submissions'
+                AND column_name = 'detected_at'
+            """)
+            row = cur.fetchone()
+            data_type = row['data_type'] if row else None
+            if data_type != 'timestamp with time zone':
+                logger.warning(f"⚠️ submissions.detected_at es '{data_type}', no timestamptz: "
+                               f"no se crea la columna detected_date")
+                return False
+            
+            logger.info("🛠️ Creando columna submissions.detected_date e índice BRIN...")
+            cur.execute("""
+                ALTER TABLE submissions
+                ADD COLUMN IF NOT EXISTS detected_date date
+                GENERATED ALWAYS AS (DATE(detected_at AT TIME ZONE 'UTC')) STORED
+            """)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS submissions_detected_date_brin
+                ON submissions USING brin (detected_date)
+            """)
+        
+        # Refrescar el schema en caché
+        self._discover_schema()
+        return True
+    
     def get_schema_info(self) -> Dict:
         """Retorna información completa del schema descubierto."""
         return {
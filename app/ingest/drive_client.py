@@ -1,9 +1,16 @@
 import os
+import functools
+import time
+import random
 import logging
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
+import httplib2
+import google_auth_httplib2
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 
@@ -16,10 +23,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Drive acepta como mucho 100 llamadas dentro de una petición batch
+_BATCH_LIMIT = 100
+
+# Códigos HTTP transitorios que se reintentan (rate limit y errores de servidor)
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Solo los campos que consume el reporte: menos bytes por respuesta
+LISTING_FIELDS = "nextPageToken, files(id, name, modifiedTime, lastModifyingUser/displayName)"
+
+
+def _backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Backoff exponencial con jitter: min(cap, base * 2**intento) * (1 + U(0, 0.5))."""
+    return min(cap, base * 2 ** attempt) * (1 + random.uniform(0, 0.5))
+
+
+@functools.lru_cache(maxsize=1)
+def _drive_discovery_doc() -> Optional[str]:
+    """Documento de descubrimiento de Drive v3 incluido en googleapiclient, leído una vez por proceso."""
+    return get_static_doc('drive', 'v3')
+
 
 class GoogleDriveClient:
-    def __init__(self):
+    def __init__(self, creds: Optional[service_account.Credentials] = None):
+        # creds: credenciales ya cargadas por quien llama (se evita releer el JSON)
         self.service = None
+        self.credentials = creds
         self.root_folder_id = os.getenv('DRIVE_FOLDER_ID')
         self.service_account_file = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON_PATH')
         
@@ -28,7 +57,7 @@ class GoogleDriveClient:
             logger.error(error_msg)
             raise ValueError(error_msg)
         
-        if not self.service_account_file:
+        if not self.service_account_file and self.credentials is None:
             error_msg = "❌ GOOGLE_SERVICE_ACCOUNT_JSON_PATH no configurado en .env"
             logger.error(error_msg)
             raise ValueError(error_msg)
@@ -42,19 +71,26 @@ class GoogleDriveClient:
         try:
             logger.info("🔐 Autenticando con Google Drive...")
             
-            # Verificar que el archivo existe
-            if not os.path.exists(self.service_account_file):
-                error_msg = f"❌ Archivo de credenciales no encontrado: {self.service_account_file}"
-                logger.error(error_msg)
-                raise FileNotFoundError(error_msg)
-            
-            # Autenticar con service account
-            credentials = service_account.Credentials.from_service_account_file(
-                self.service_account_file,
-                scopes=['https://www.googleapis.com/auth/drive.readonly']
-            )
-            
-            self.service = build('drive', 'v3', credentials=credentials)
+            credentials = self.credentials
+            if credentials is None:
+                # Verificar que el archivo existe
+                if not os.path.exists(self.service_account_file):
+                    error_msg = f"❌ Archivo de credenciales no encontrado: {self.service_account_file}"
+                    logger.error(error_msg)
+                    raise FileNotFoundError(error_msg)
+                
+                # Autenticar con service account
+                credentials = service_account.Credentials.from_service_account_file(
+                    self.service_account_file,
+                    scopes=['https://www.googleapis.com/auth/drive.readonly']
+                )
+            
+            self.credentials = credentials
+            discovery_doc = _drive_discovery_doc()
+            if discovery_doc is not None:
+                self.service = build_from_document(discovery_doc, credentials=credentials)
+            else:
+                self.service = build('drive', 'v3', credentials=credentials, cache_discovery=False)
             logger.info("✅ Autenticación exitosa con Google Drive")
             
             # Verificar acceso a la carpeta raíz
@@ -162,6 +198,169 @@ class GoogleDriveClient:
             logger.error(error_msg)
             raise
     
+    def list_files_in_folders(self, folder_ids: List[str], fields: str = LISTING_FIELDS,
+                              max_retries: int = 5) -> Dict[str, Union[List[Dict], Exception]]:
+        """
+        Lista los archivos de varias carpetas con peticiones batch de hasta 100 llamadas.
+        
+        Cada carpeta es una llamada files.list dentro del batch, así N carpetas cuestan
+        ceil(N/100) viajes en vez de N. Las llamadas que responden 429/5xx se reintentan
+        con backoff exponencial; las carpetas con más de una página siguen paginando aparte.
+        
+        Args:
+            folder_ids: IDs de las carpetas a listar
+            fields: Campos de la respuesta (por defecto solo los que usa el reporte)
+            max_retries: Intentos por carpeta ante errores transitorios
+            
+        Returns:
+            Dict[str, Union[List[Dict], Exception]]: Archivos por carpeta, o la excepción
+            si esa carpeta no se pudo listar
+        """
+        return dict(self.iter_files_in_folders(folder_ids, fields, max_retries))
+    
+    def iter_files_in_folders(self, folder_ids: List[str], fields: str = LISTING_FIELDS,
+                              max_retries: int = 5, max_workers: int = 8,
+                              list_params: Optional[Dict] = None) -> Iterator[Tuple[str, Union[List[Dict], Exception]]]:
+        """
+        Como list_files_in_folders, pero entrega cada carpeta en cuanto termina su batch.
+        
+        Con más de un batch (más de 100 carpetas), los batches van en paralelo en un
+        pool acotado: cada hilo usa su propia conexión HTTP porque httplib2 no es
+        thread-safe. Los hilos solo esperan red, así que el GIL no estorba.
+        
+        list_params se pasa tal cual a files.list (por ejemplo pageSize u orderBy).
+        
+        Yields:
+            Tuple[str, Union[List[Dict], Exception]]: (ID de carpeta, archivos o excepción)
+        """
+        logger.info(f"🔍 Listando archivos de {len(folder_ids)} carpetas en batch")
+        
+        unique_ids = list(dict.fromkeys(folder_ids))
+        chunks = [unique_ids[start:start + _BATCH_LIMIT] for start in range(0, len(unique_ids), _BATCH_LIMIT)]
+        total = 0
+        
+        if len(chunks) <= 1:
+            # Un solo batch: en este hilo, con la conexión del servicio
+            for chunk in chunks:
+                for folder_id, files in self._list_batch(chunk, fields, max_retries, list_params=list_params).items():
+                    total += 0 if isinstance(files, Exception) else len(files)
+                    yield folder_id, files
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks)),
+                                    thread_name_prefix='drive-batch') as executor:
+                futures = {executor.submit(self._list_batch, chunk, fields, max_retries,
+                                           self._new_http(), list_params): chunk
+                           for chunk in chunks}
+                for future in as_completed(futures):
+                    try:
+                        listed = future.result()
+                    except Exception as e:
+                        # Un batch que falla del todo no corta el resto: error por carpeta
+                        logger.error(f"❌ Error al listar un batch de {len(futures[future])} carpetas: {e}")
+                        listed = {folder_id: e for folder_id in futures[future]}
+                    for folder_id, files in listed.items():
+                        total += 0 if isinstance(files, Exception) else len(files)
+                        yield folder_id, files
+        
+        logger.info(f"✅ Encontrados {total} archivos en {len(unique_ids)} carpetas")
+    
+    def latest_modified_times(self, folder_ids: List[str],
+                              max_retries: int = 5) -> Dict[str, Union[Optional[str], Exception]]:
+        """
+        modifiedTime del archivo más reciente de cada carpeta (None si está vacía).
+        
+        Es la señal de contenido para cachear listados: el modifiedTime de la carpeta
+        no siempre cambia al subir o editar archivos dentro. Cuesta una llamada
+        files.list de un solo resultado por carpeta, agrupadas en batch.
+        
+        Returns:
+            Dict[str, Union[Optional[str], Exception]]: Fecha por carpeta, o la excepción
+        """
+        params = {'pageSize': 1, 'orderBy': 'modifiedTime desc'}
+        return {
+            folder_id: files if isinstance(files, Exception) else (files[0].get('modifiedTime') if files else None)
+            for folder_id, files in self.iter_files_in_folders(folder_ids, 'files(modifiedTime)',
+                                                               max_retries, list_params=params)
+        }
+    
+    def _new_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """Conexión HTTP autorizada nueva, para usar desde otro hilo."""
+        return google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+    
+    def _files_list_request(self, folder_id: str, fields: str, page_token: Optional[str] = None,
+                            list_params: Optional[Dict] = None):
+        """Petición files.list (sin ejecutar) de una página de la carpeta."""
+        params = {'pageSize': 1000, **(list_params or {})}
+        return self.service.files().list(
+            q=f"'{folder_id}' in parents and trashed=false",
+            fields=fields,
+            pageToken=page_token,
+            **params
+        )
+    
+    def _list_batch(self, folder_ids: List[str], fields: str, max_retries: int,
+                    http: Optional[google_auth_httplib2.AuthorizedHttp] = None,
+                    list_params: Optional[Dict] = None) -> Dict[str, Union[List[Dict], Exception]]:
+        """Lista hasta _BATCH_LIMIT carpetas en una petición batch, con reintentos (http: conexión del hilo)."""
+        results = {}
+        next_pages = {}
+        pending = folder_ids
+        
+        for attempt in range(max_retries):
+            retry = []
+            
+            def on_response(folder_id, response, exception):
+                if exception is None:
+                    results[folder_id] = response.get('files', [])
+                    if response.get('nextPageToken'):
+                        next_pages[folder_id] = response['nextPageToken']
+                elif (isinstance(exception, HttpError) and exception.resp.status in _RETRYABLE_STATUS
+                      and attempt < max_retries - 1):
+                    retry.append(folder_id)
+                else:
+                    logger.error(f"❌ Error al listar archivos en carpeta {folder_id}: {exception}")
+                    results[folder_id] = exception
+            
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for folder_id in pending:
+                batch.add(self._files_list_request(folder_id, fields, list_params=list_params), request_id=folder_id)
+            try:
+                batch.execute(http=http)
+            except Exception as e:
+                # Fallo de transporte (timeout, SSL, DNS...): afecta a las carpetas del batch
+                # que aún no tienen respuesta; las ya respondidas conservan su resultado
+                unanswered = [folder_id for folder_id in pending
+                              if folder_id not in results and folder_id not in retry]
+                if attempt < max_retries - 1:
+                    retry.extend(unanswered)
+                else:
+                    for folder_id in unanswered:
+                        logger.error(f"❌ Error al listar archivos en carpeta {folder_id}: {e}")
+                        results[folder_id] = e
+            
+            if not retry:
+                break
+            
+            delay = _backoff_delay(attempt)
+            logger.warning(f"⚠️ {len(retry)} carpetas con error transitorio, reintento "
+                           f"{attempt + 1}/{max_retries - 1} en {delay:.1f}s...")
+            time.sleep(delay)
+            pending = retry
+        
+        # Carpetas con más de una página: el resto se pide fuera del batch
+        for folder_id, page_token in next_pages.items():
+            try:
+                while page_token:
+                    response = self._files_list_request(folder_id, fields, page_token, list_params).execute(
+                        http=http, num_retries=max_retries)
+                    results[folder_id].extend(response.get('files', []))
+                    page_token = response.get('nextPageToken')
+            except Exception as e:
+                logger.error(f"❌ Error al listar archivos en carpeta {folder_id}: {e}")
+                results[folder_id] = e
+        
+        return results
+    
     def get_file_metadata(self, file_id: str) -> Dict:
         try:
             logger.debug(f"📋 Obteniendo metadata de archivo: {file_id}")
@@ -378,9 +378,20 @@ if __name__ == "__main__":
             except Exception as e:
                 print(f"❌ Error en configuración: {e}")
                 exit_code = 1
+        elif command == 'migrate':
+            # Migraciones de esquema para los reportes
+            try:
+                if adaptive_dao.ensure_detected_date_column():
+                    print("✅ Columna submissions.detected_date e índice BRIN creados")
+                else:
+                    print("✅ El esquema ya estaba actualizado")
+                exit_code = 0
+            except Exception as e:
+                print(f"❌ Error aplicando migraciones: {e}")
+                exit_code = 1
         else:
             print(f"❌ Comando desconocido: {command}")
-            print("💡 Comandos disponibles: status, test")
+            print("💡 Comandos disponibles: status, test, migrate")
             exit_code = 1
     else:
         # Ejecutar reporte automático (comportamiento por defecto)
@@ -5,17 +5,418 @@ Módulo SIMPLE y FUNCIONAL para envío de reportes con Resend.
 NO necesita contraseñas complicadas, solo una API key.
 """
 
-import resend
+import atexit
+import functools
+import json
 import os
 import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
+from string import Template
+from typing import List, Optional, Union
 import base64
 
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el json estándar vía requests
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
-# Configurar Resend con API key desde .env
-resend.api_key = os.getenv('RESEND_API_KEY', 're_SWfMgbqa_BbseM4uvfCNfcBc62yY8qaiE')
+
+class _PooledHTTPClient:
+    """Cliente HTTP para el SDK de Resend que usa la sesión compartida."""
+    
+    def __init__(self, session, timeout: int = 30):
+        self._session = session
+        self._timeout = timeout
+    
+    def request(self, method, url, headers, json=None):
+        if json is not None and orjson is not None:
+            # orjson serializa directo a bytes UTF-8 (el HTML y el base64 no se re-escapan en Python)
+            headers = {**headers, 'Content-Type': 'application/json'}
+            resp = self._session.request(method=method, url=url, headers=headers,
+                                         data=orjson.dumps(json), timeout=self._timeout)
+        else:
+            resp = self._session.request(method=method, url=url, headers=headers,
+                                         json=json, timeout=self._timeout)
+        return resp.content, resp.status_code, resp.headers
+
+
+# El SDK (y requests/urllib3/SSL detrás) se importa en el primer envío, no al importar
+# este módulo: quien solo genera reportes no paga ese arranque.
+_resend = None
+_resend_lock = threading.Lock()
+
+
+def _get_resend():
+    """
+    Importa y configura el SDK de Resend en el primer uso.
+    
+    Raises:
+        RuntimeError: Si RESEND_API_KEY no está configurada
+    """
+    global _resend
+    if _resend is None:
+        with _resend_lock:
+            if _resend is None:
+                import resend
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                # Configurar Resend con API key desde .env (sin valor por defecto en el código)
+                api_key = os.environ.get('RESEND_API_KEY')
+                if not api_key:
+                    raise RuntimeError("RESEND_API_KEY not set")
+                resend.api_key = api_key
+                
+                # Sesión HTTP compartida: reutiliza la conexión TLS a api.resend.com entre envíos.
+                # pool_maxsize=5 basta para los envíos concurrentes que hacemos (un reporte por clase);
+                # max_retries=0 porque los reintentos los maneja _send_with_retry.
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_connections=5, pool_maxsize=5, max_retries=0))
+                
+                # Las versiones recientes del SDK permiten inyectar el cliente HTTP; en las antiguas
+                # cada envío sigue abriendo su propia conexión.
+                if hasattr(resend, 'default_http_client'):
+                    resend.default_http_client = _PooledHTTPClient(session)
+                else:
+                    logger.debug("SDK de Resend sin default_http_client - envíos sin pool de conexiones")
+                
+                _resend = resend
+    return _resend
+
+
+def _try_get_resend():
+    """Como _get_resend, pero registra el error y devuelve None si falta la API key o el SDK."""
+    try:
+        return _get_resend()
+    except (RuntimeError, ImportError) as e:
+        logger.error(f"❌ Resend no disponible: {e}")
+        return None
+
+
+# Códigos HTTP transitorios que se reintentan. El resto (400/401/403/404/422...) falla de inmediato.
+_RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Extrae el código HTTP de un error de Resend (si lo trae)."""
+    code = getattr(error, 'status_code', None) or getattr(error, 'code', None)
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_transient(error: Exception) -> bool:
+    """True si el error de envío merece reintento (red caída, timeout o 408/425/429/5xx)."""
+    import requests  # ya cargado por el SDK
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return _status_code(error) in _RETRYABLE_STATUS
+
+
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Backoff exponencial con jitter: min(cap, base * 2**intento) * (1 + U(0, 0.5))."""
+    return min(cap, base * 2 ** attempt) * (1 + random.uniform(0, 0.5))
+
+
+def _send_with_retry(payload: dict, idempotency_key: Optional[str] = None,
+                     max_retries: int = 3, base: float = 1.0, cap: float = 30.0) -> dict:
+    """
+    Envía el payload con Resend reintentando errores transitorios.
+    
+    Usa backoff exponencial con jitter: delay = min(cap, base * 2**intento) * (1 + U(0, 0.5)).
+    Los errores 4xx definitivos (auth, validación) se propagan sin reintentar.
+    Todos los intentos comparten la misma Idempotency-Key, así un reintento tras un
+    timeout no duplica el email si el primer intento sí llegó a Resend.
+    
+    Args:
+        payload: Parámetros para resend.Emails.send, o lista de ellos (sin adjuntos) para resend.Batch.send
+        idempotency_key: Clave del envío lógico (se genera una si no se indica)
+        max_retries: Número total de intentos
+        base: Delay base en segundos
+        cap: Delay máximo en segundos (antes del jitter)
+        
+    Returns:
+        dict: Respuesta de Resend
+        
+    Raises:
+        ValueError: Si se intenta enviar un batch con adjuntos
+    """
+    resend = _get_resend()
+    import requests  # ya cargado por el SDK
+    
+    # Errores de red (siempre se reintentan) y errores de la API (se clasifican por código).
+    # Cualquier otra excepción (MemoryError, KeyboardInterrupt, bugs) se propaga tal cual.
+    retryable = (requests.ConnectionError, requests.Timeout)
+    fatal = (resend.exceptions.ResendError,)
+    
+    options = {"idempotency_key": idempotency_key or str(uuid.uuid4())}
+    
+    # El endpoint batch rechaza (o descarta) los adjuntos: nunca deben llegar ahí
+    if isinstance(payload, list) and any(item.get('attachments') for item in payload):
+        raise ValueError("resend.Batch.send no admite adjuntos; enviar cada email con Emails.send")
+    
+    for attempt in range(max_retries):
+        try:
+            if isinstance(payload, list):
+                return resend.Batch.send(payload, options=options)
+            return resend.Emails.send(payload, options=options)
+        except retryable + fatal as e:
+            if not _is_transient(e) or attempt == max_retries - 1:
+                raise
+            reason = _status_code(e) or type(e).__name__
+        
+        delay = _backoff_delay(attempt, base, cap)
+        logger.warning(f"⚠️ Fallo transitorio en Resend ({reason}), reintento "
+                       f"{attempt + 1}/{max_retries - 1} en {delay:.1f}s...")
+        time.sleep(delay)
+
+
+# Outbox de reintentos: los envíos que siguen fallando por un error transitorio tras
+# los reintentos se guardan en SQLite. drain_outbox() los reenvía: se llama al inicio
+# de cada send_report_email y desde cron con "python -m app.notify.resend_emailer drain".
+_OUTBOX_DB = os.getenv('RESEND_OUTBOX_DB', 'resend_outbox.db')
+_OUTBOX_BASE = 60.0        # primer reintento a ~1 minuto
+_OUTBOX_CAP = 3600.0       # como mucho una hora entre reintentos
+_OUTBOX_MAX_ATTEMPTS = 8
+# Un solo hilo vacía el outbox a la vez (los demás no esperan, lo hará ese hilo)
+_drain_lock = threading.Lock()
+
+
+def _dumps(obj) -> str:
+    return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+
+
+def _loads(data: str):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _outbox_connect() -> sqlite3.Connection:
+    """Abre la base del outbox creando la tabla si no existe."""
+    conn = sqlite3.connect(_OUTBOX_DB, timeout=10)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            idempotency_key TEXT NOT NULL UNIQUE,
+            payload_json TEXT NOT NULL,
+            next_retry_at REAL NOT NULL,
+            attempt INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    return conn
+
+
+def _outbox_put(payload: dict, idempotency_key: str, attempt: int = 1) -> None:
+    """Encola un envío para reintentarlo más tarde (misma Idempotency-Key)."""
+    next_retry_at = time.time() + _backoff_delay(attempt - 1, _OUTBOX_BASE, _OUTBOX_CAP)
+    with closing(_outbox_connect()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO outbox (idempotency_key, payload_json, next_retry_at, attempt) "
+            "VALUES (?, ?, ?, ?)",
+            (idempotency_key, _dumps(payload), next_retry_at, attempt)
+        )
+
+
+def drain_outbox() -> int:
+    """
+    Reenvía los emails del outbox cuyo reintento ya venció.
+    
+    Cada fila se intenta una vez: si vuelve a fallar de forma transitoria se
+    reprograma con el siguiente backoff; si falla de forma definitiva o agota
+    _OUTBOX_MAX_ATTEMPTS se descarta y queda registrado en el log. Si otro hilo
+    ya está vaciando el outbox no hace nada.
+    
+    Returns:
+        int: Número de emails enviados
+    """
+    resend = _try_get_resend()
+    if resend is None:
+        return 0
+    if not _drain_lock.acquire(blocking=False):
+        return 0
+    try:
+        return _drain_due(resend)
+    finally:
+        _drain_lock.release()
+
+
+def _drain_due(resend) -> int:
+    """Cuerpo de drain_outbox (con _drain_lock tomado)."""
+    import requests  # ya cargado por el SDK
+    errors = (requests.ConnectionError, requests.Timeout, resend.exceptions.ResendError)
+    
+    with closing(_outbox_connect()) as conn:
+        rows = conn.execute(
+            "SELECT id, idempotency_key, payload_json, attempt FROM outbox "
+            "WHERE next_retry_at <= ? ORDER BY next_retry_at",
+            (time.time(),)
+        ).fetchall()
+        
+        sent = 0
+        for row_id, key, payload_json, attempt in rows:
+            try:
+                response = _send_with_retry(_loads(payload_json), idempotency_key=key, max_retries=1)
+            except errors as e:
+                if _is_transient(e) and attempt < _OUTBOX_MAX_ATTEMPTS:
+                    next_retry_at = time.time() + _backoff_delay(attempt, _OUTBOX_BASE, _OUTBOX_CAP)
+                    with conn:
+                        conn.execute("UPDATE outbox SET attempt = ?, next_retry_at = ? WHERE id = ?",
+                                     (attempt + 1, next_retry_at, row_id))
+                    logger.warning(f"⚠️ Reintento {attempt} del outbox falló ({e}), reprogramado")
+                    continue
+                logger.error(f"❌ Envío del outbox descartado tras {attempt} intentos: {e}")
+            else:
+                sent += 1
+                logger.info(f"✅ Email del outbox enviado - ID: {', '.join(map(str, _response_ids(response)))}")
+            with conn:
+                conn.execute("DELETE FROM outbox WHERE id = ?", (row_id,))
+    
+    return sent
+
+
+# Máximo de emails por petición al endpoint batch de Resend
+_MAX_EMAILS_PER_BATCH = 100
+
+
+def _payload_groups(base: dict, recipients: Union[str, List[str]]) -> List[Union[dict, List[dict]]]:
+    """
+    Un payload por destinatario, agrupados en batches de hasta _MAX_EMAILS_PER_BATCH.
+    
+    Cada email lleva una sola dirección en "to" (nadie ve las direcciones de los
+    demás); HTML y adjunto se comparten por referencia. El endpoint batch de Resend
+    no admite adjuntos: con "attachments" cada email va suelto por Emails.send
+    (misma sesión HTTP). Un destinatario suelto (str) también es un envío normal.
+    """
+    if not isinstance(recipients, list):
+        return [dict(base, to=recipients)]
+    payloads = [dict(base, to=address) for address in recipients]
+    if base.get('attachments'):
+        return payloads
+    return [payloads[i:i + _MAX_EMAILS_PER_BATCH]
+            for i in range(0, len(payloads), _MAX_EMAILS_PER_BATCH)]
+
+
+def _response_ids(response) -> List[str]:
+    """IDs de una respuesta de Emails.send ({'id': ...}) o de Batch.send ({'data': [...]})."""
+    if 'data' in response:
+        return [item.get('id') for item in response['data']]
+    return [response.get('id')]
+
+
+# Bloque de lectura múltiplo de 3 bytes: cada bloque se codifica sin padding intermedio
+_B64_CHUNK = 3 * 256 * 1024
+
+
+def _encode_file_b64(path: str, size: int) -> str:
+    """
+    Codifica un archivo en base64 por bloques sobre un buffer preasignado.
+    
+    Se usa b64encode y no encodebytes a propósito: Resend transporta el adjunto
+    en JSON, no en MIME, así que no hace falta cortar en líneas de 76 columnas
+    (encodebytes inserta un salto cada 57 bytes y es más lento). Si algún día se
+    envía por SMTP/MIME, el corte de líneas corresponde a la librería de email.
+    
+    Args:
+        path: Ruta del archivo
+        size: Tamaño en bytes (de os.stat) para reservar el buffer exacto
+        
+    Returns:
+        str: Contenido del archivo en base64
+    """
+    out = bytearray(((size + 2) // 3) * 4)
+    pos = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(_B64_CHUNK)
+            if not chunk:
+                break
+            encoded = base64.b64encode(chunk)
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+    
+    # Si el archivo cambió entre el stat y la lectura, recortar al tamaño real
+    if pos != len(out):
+        del out[pos:]
+    return out.decode('ascii')
+
+
+@functools.lru_cache(maxsize=8)
+def _encode_file_b64_cached(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Versión memoizada de _encode_file_b64.
+    
+    La clave incluye mtime y tamaño: si el Excel se regenera en la misma ruta
+    se vuelve a codificar; si se reintenta el mismo archivo se reutiliza el base64.
+    """
+    return _encode_file_b64(path, size)
+
+
+# Plantillas HTML (se construyen una sola vez al importar el módulo).
+# Template pre-tokeniza $filename/$date; un "$" literal en el HTML debe escribirse "$$".
+_REPORT_HTML_TMPL = Template("""
+<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+    <h2 style="color: #1E3A8A;">🎓 Reporte Automático - Jean Academy</h2>
+
+    <p>¡Hola!</p>
+
+    <p>Te enviamos el reporte automático de actividad académica.</p>
+
+    <div style="background: #F3F4F6; padding: 15px; border-radius: 8px; margin: 20px 0;">
+        <h3 style="color: #1E3A8A; margin-top: 0;">📊 Contenido del Reporte:</h3>
+        <ul style="color: #4B5563;">
+            <li>✅ Resumen ejecutivo con KPIs principales</li>
+            <li>📚 Detalle de actividad por módulo</li>
+            <li>👥 Progreso individual de estudiantes</li>
+            <li>📝 Entregas recientes procesadas</li>
+            <li>📈 Estadísticas y gráficos de tendencias</li>
+        </ul>
+    </div>
+
+    <p><strong>📁 Archivo adjunto:</strong> $filename</p>
+    <p><strong>📅 Generado:</strong> $date</p>
+
+    <hr style="border: none; border-top: 1px solid #E5E7EB; margin: 30px 0;">
+
+    <p style="color: #6B7280; font-size: 12px;">
+        🤖 Reporte generado automáticamente por Jean Academy Analytics<br>
+        💻 Desarrollado con Claude Code<br>
+        📧 Enviado con Resend
+    </p>
+</div>
+""")
+
+_TEST_HTML = """
+<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+    <h2 style="color: #10B981;">✅ ¡Email de Prueba Exitoso!</h2>
+
+    <p>Si estás viendo este mensaje, significa que:</p>
+
+    <ul>
+        <li>✅ Resend está configurado correctamente</li>
+        <li>✅ Los emails funcionan perfectamente</li>
+        <li>✅ Los reportes se enviarán sin problemas</li>
+    </ul>
+
+    <div style="background: #F0FDF4; padding: 15px; border-radius: 8px; border-left: 4px solid #10B981;">
+        <strong>🎉 ¡El sistema está listo para usar!</strong>
+    </div>
+
+    <p style="margin-top: 30px; color: #6B7280; font-size: 12px;">
+        🎓 Jean Academy Analytics<br>
+        💻 Desarrollado con Claude Code<br>
+        📧 Powered by Resend
+    </p>
+</div>
+"""
 
 
 class ResendEmailer:
@@ -31,87 +432,124 @@ class ResendEmailer:
         
         logger.info(f"📧 Resend configurado - Destinatario: {self.recipient_email}")
     
-    def send_report_email(self, excel_file_path: str, recipient_email: str = None) -> bool:
+    def send_report_email(self, excel_file_path: str,
+                          recipient_email: Union[str, List[str]] = None,
+                          generated_at: Optional[str] = None) -> bool:
         """
         Envía reporte Excel por email usando Resend.
         
+        Con una lista de destinatarios se arma un email por dirección, compartiendo
+        el mismo adjunto codificado. Como el reporte lleva adjunto y el endpoint batch
+        de Resend no los admite, cada email se envía con Emails.send sobre la sesión
+        HTTP compartida.
+        
+        Antes de enviar se vacían los pendientes vencidos del outbox (drain_outbox).
+        Cada envío se reintenta con backoff (_send_with_retry); si aun así falla por
+        un error transitorio solo ese envío se guarda en el outbox para un reintento
+        posterior, pero cuenta como NO enviado. Los envíos ya hechos nunca se
+        reencolan. Si uno falla de forma definitiva se sigue con los demás y se
+        registra cuántos destinatarios sí se enviaron.
+        
         Args:
             excel_file_path: Ruta del archivo Excel a enviar
-            recipient_email: Email destinatario (opcional, usa el configurado por defecto)
+            recipient_email: Email o lista de emails destinatarios (opcional, usa el configurado por defecto)
+            generated_at: Fecha ya formateada ('%d/%m/%Y %H:%M'); en lotes se calcula una vez
             
         Returns:
-            bool: True si se envió exitosamente
+            bool: True solo si se envió a todos los destinatarios; si alguno falló o quedó
+            encolado devuelve False y el log indica cuántos se enviaron y cuántos esperan
+            en el outbox
         """
+        # Usar destinatario específico o el configurado
+        to_email = recipient_email or self.recipient_email
+        
+        logger.info(f"📤 Enviando reporte a {to_email}...")
+        
+        # Verificar que el archivo existe (un solo stat, reutilizamos el tamaño) y codificarlo.
+        # Fuera del try del envío: un MemoryError aquí debe llegar al llamador.
         try:
-            # Usar destinatario específico o el configurado
-            to_email = recipient_email or self.recipient_email
-            
-            logger.info(f"📤 Enviando reporte a {to_email}...")
-            
-            # Verificar que el archivo existe
-            if not Path(excel_file_path).exists():
-                logger.error(f"❌ Archivo no encontrado: {excel_file_path}")
-                return False
-            
-            # Leer el archivo Excel
-            with open(excel_file_path, 'rb') as f:
-                file_content = f.read()
-                file_base64 = base64.b64encode(file_content).decode()
-            
-            # Nombre del archivo
-            filename = Path(excel_file_path).name
-            
-            # Fecha y hora actual
-            current_date = datetime.now().strftime('%d/%m/%Y %H:%M')
-            
-            # Crear email con Resend
-            response = resend.Emails.send({
-                "from": self.sender_email,
-                "to": to_email,
-                "subject": f"📊 Reporte Jean Academy - {current_date}",
-                "html": f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #1E3A8A;">🎓 Reporte Automático - Jean Academy</h2>
-                    
-                    <p>¡Hola!</p>
-                    
-                    <p>Te enviamos el reporte automático de actividad académica.</p>
-                    
-                    <div style="background: #F3F4F6; padding: 15px; border-radius: 8px; margin: 20px 0;">
-                        <h3 style="color: #1E3A8A; margin-top: 0;">📊 Contenido del Reporte:</h3>
-                        <ul style="color: #4B5563;">
-                            <li>✅ Resumen ejecutivo con KPIs principales</li>
-                            <li>📚 Detalle de actividad por módulo</li>
-                            <li>👥 Progreso individual de estudiantes</li>
-                            <li>📝 Entregas recientes procesadas</li>
-                            <li>📈 Estadísticas y gráficos de tendencias</li>
-                        </ul>
-                    </div>
-                    
-                    <p><strong>📁 Archivo adjunto:</strong> {filename}</p>
-                    <p><strong>📅 Generado:</strong> {current_date}</p>
-                    
-                    <hr style="border: none; border-top: 1px solid #E5E7EB; margin: 30px 0;">
-                    
-                    <p style="color: #6B7280; font-size: 12px;">
-                        🤖 Reporte generado automáticamente por Jean Academy Analytics<br>
-                        💻 Desarrollado con Claude Code<br>
-                        📧 Enviado con Resend
-                    </p>
-                </div>
-                """,
-                "attachments": [{
-                    "filename": filename,
-                    "content": file_base64
-                }]
-            })
-            
-            logger.info(f"✅ Email enviado exitosamente - ID: {response.get('id')}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Error enviando email con Resend: {e}")
+            st = os.stat(excel_file_path)
+            file_base64 = _encode_file_b64_cached(excel_file_path, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            logger.error(f"❌ Archivo no encontrado: {excel_file_path}")
             return False
+        except OSError as e:
+            logger.error(f"❌ No se pudo leer el archivo {excel_file_path}: {e}")
+            return False
+        
+        # Nombre del archivo
+        filename = os.path.basename(excel_file_path)
+        
+        # Fecha y hora actual (o la del lote)
+        current_date = generated_at or datetime.now().strftime('%d/%m/%Y %H:%M')
+        
+        # El HTML y el base64 se construyen una vez y se comparten por referencia entre envíos
+        html = _REPORT_HTML_TMPL.substitute(filename=filename, date=current_date)
+        attachments = [{
+            "filename": filename,
+            "content": file_base64
+        }]
+        
+        resend = _try_get_resend()
+        if resend is None:
+            return False
+        
+        import requests  # ya cargado por el SDK
+        
+        # Reenviar lo que quedó pendiente de envíos anteriores (si existe el outbox)
+        if os.path.exists(_OUTBOX_DB):
+            try:
+                drain_outbox()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ No se pudo vaciar el outbox: {e}")
+        
+        base = {
+            "from": self.sender_email,
+            "subject": f"📊 Reporte Jean Academy - {current_date}",
+            "html": html,
+            "attachments": attachments
+        }
+        
+        total = len(to_email) if isinstance(to_email, list) else 1
+        sent = 0
+        queued = 0
+        all_ok = True
+        sent_ids = []
+        for payload in _payload_groups(base, to_email):
+            count = len(payload) if isinstance(payload, list) else 1
+            key = str(uuid.uuid4())
+            try:
+                # Enviar con Resend (con backoff; lo que siga fallando va al outbox)
+                response = _send_with_retry(payload, idempotency_key=key)
+            except (resend.exceptions.ResendError, requests.ConnectionError, requests.Timeout) as e:
+                if not _is_transient(e):
+                    logger.error(f"❌ Error enviando email con Resend: {e}")
+                    all_ok = False
+                    continue
+                try:
+                    _outbox_put(payload, key)
+                except sqlite3.Error as db_error:
+                    logger.error(f"❌ Error enviando email con Resend: {e} (outbox no disponible: {db_error})")
+                    all_ok = False
+                    continue
+                logger.warning(f"📥 Fallo transitorio ({e}), {count} email(s) encolado(s) en el outbox, "
+                               f"NO enviado(s) todavía")
+                queued += count
+                all_ok = False
+                continue
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ Error enviando email con Resend: {e}")
+                all_ok = False
+                continue
+            sent += count
+            sent_ids.extend(_response_ids(response))
+        
+        if sent_ids:
+            logger.info(f"✅ Email enviado exitosamente - ID: {', '.join(map(str, sent_ids))}")
+        if not all_ok and (sent or queued):
+            logger.warning(f"⚠️ Envío parcial: {sent} de {total} destinatarios enviados, "
+                           f"{queued} en el outbox pendientes de reintento")
+        return all_ok
     
     def send_test_email(self, recipient_email: str = None) -> bool:
         """
@@ -123,53 +561,67 @@ class ResendEmailer:
         Returns:
             bool: True si se envió exitosamente
         """
+        to_email = recipient_email or self.recipient_email
+        
+        logger.info(f"🧪 Enviando email de prueba a {to_email}...")
+        
+        resend = _try_get_resend()
+        if resend is None:
+            return False
+        
         try:
-            to_email = recipient_email or self.recipient_email
-            
-            logger.info(f"🧪 Enviando email de prueba a {to_email}...")
-            
-            response = resend.Emails.send({
+            response = _send_with_retry({
                 "from": self.sender_email,
                 "to": to_email,
                 "subject": "🧪 Prueba - Jean Academy Analytics",
-                "html": """
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #10B981;">✅ ¡Email de Prueba Exitoso!</h2>
-                    
-                    <p>Si estás viendo este mensaje, significa que:</p>
-                    
-                    <ul>
-                        <li>✅ Resend está configurado correctamente</li>
-                        <li>✅ Los emails funcionan perfectamente</li>
-                        <li>✅ Los reportes se enviarán sin problemas</li>
-                    </ul>
-                    
-                    <div style="background: #F0FDF4; padding: 15px; border-radius: 8px; border-left: 4px solid #10B981;">
-                        <strong>🎉 ¡El sistema está listo para usar!</strong>
-                    </div>
-                    
-                    <p style="margin-top: 30px; color: #6B7280; font-size: 12px;">
-                        🎓 Jean Academy Analytics<br>
-                        💻 Desarrollado con Claude Code<br>
-                        📧 Powered by Resend
-                    </p>
-                </div>
-                """
+                "html": _TEST_HTML
             })
-            
-            logger.info(f"✅ Email de prueba enviado - ID: {response.get('id')}")
-            return True
-            
-        except Exception as e:
+        except (resend.exceptions.ResendError, OSError, ValueError) as e:
             logger.error(f"❌ Error enviando email de prueba: {e}")
             return False
+        
+        logger.info(f"✅ Email de prueba enviado - ID: {response.get('id')}")
+        return True
+
+
+# Instancia única por proceso (configuración y sesión se crean una sola vez)
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_emailer() -> ResendEmailer:
+    """Devuelve el ResendEmailer compartido, creándolo en el primer uso."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = ResendEmailer()
+    return _instance
 
 
 # Función principal para usar desde otros módulos
-def send_report(excel_file: str, recipient: str = None) -> bool:
+def send_report(excel_file: str, recipient: Union[str, List[str]] = None,
+                generated_at: Optional[str] = None) -> bool:
     """Envía reporte por email usando Resend."""
-    emailer = ResendEmailer()
-    return emailer.send_report_email(excel_file, recipient)
+    return get_emailer().send_report_email(excel_file, recipient, generated_at)
+
+
+# Pool acotado para envíos en segundo plano (mismo tamaño que el pool HTTP)
+_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv('RESEND_POOL', '5')),
+                               thread_name_prefix='resend')
+# Al salir del intérprete se esperan los envíos pendientes
+atexit.register(_EXECUTOR.shutdown, wait=True)
+
+
+def send_report_async(excel_file: str, recipient: Union[str, List[str]] = None,
+                      generated_at: Optional[str] = None) -> Future:
+    """
+    Envía reporte por email en segundo plano.
+    
+    Returns:
+        Future: Se resuelve con el bool de send_report
+    """
+    return _EXECUTOR.submit(send_report, excel_file, recipient, generated_at)
 
 
 # Script de prueba
@@ -183,6 +635,16 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
     
+    if not os.environ.get('RESEND_API_KEY'):
+        print("❌ RESEND_API_KEY no configurada")
+        print("Agrega la API key de Resend en el archivo .env")
+        sys.exit(1)
+    
+    # "drain" reenvía los emails pendientes del outbox (para cron)
+    if len(sys.argv) > 1 and sys.argv[1] == 'drain':
+        print(f"📥 Emails del outbox enviados: {drain_outbox()}")
+        sys.exit(0)
+    
     emailer = ResendEmailer()
     
     # Si se pasa un email como argumento, usarlo
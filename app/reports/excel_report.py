@@ -1,25 +1,142 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import os
 from typing import Dict, List, Optional
 import logging
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.chart import BarChart, PieChart, Reference
-from openpyxl.utils.dataframe import dataframe_to_rows
-import xlsxwriter
+import threading
 
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-
-from app.db.adaptive_dao import adaptive_dao
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow es opcional: sin él se usa DataFrame.from_records
+    pa = None
 
 logger = logging.getLogger(__name__)
 
 
+# Resumen general, estadísticas por día y top estudiantes más activos.
+# Una sola pasada sobre submissions: GROUPING SETS calcula los tres niveles de
+# agregación y GROUPING(date, student_id) indica a cuál pertenece cada fila
+# (3 = total, 1 = por día, 2 = por estudiante). El resumen es histórico, el resto
+# solo cuenta las entregas posteriores a la fecha de corte (is_recent).
+SQL_SUBMISSION_STATS = """
+    WITH sub AS (
+        SELECT
+            id,
+            student_id,
+            {date_expr} as date,
+            detected_at > %s as is_recent
+        FROM submissions
+    ),
+    grouped AS (
+        SELECT
+            GROUPING(date, student_id) as grouping_id,
+            date,
+            student_id,
+            COUNT(id) as submissions,
+            COUNT(DISTINCT student_id) as students,
+            COUNT(id) FILTER (WHERE is_recent) as recent_submissions,
+            COUNT(DISTINCT student_id) FILTER (WHERE is_recent) as active_students
+        FROM sub
+        GROUP BY GROUPING SETS ((), (date), (student_id))
+        HAVING GROUPING(date, student_id) = 3 OR COUNT(id) FILTER (WHERE is_recent) > 0
+    ),
+    ranked AS (
+        SELECT
+            g.*,
+            ROW_NUMBER() OVER (PARTITION BY grouping_id ORDER BY recent_submissions DESC) as student_rank
+        FROM grouped g
+    )
+    SELECT
+        r.grouping_id,
+        r.date,
+        st.full_name,
+        r.submissions,
+        r.students,
+        r.recent_submissions,
+        r.active_students,
+        (SELECT COUNT(*) FROM modules) as total_modules
+    FROM ranked r
+    LEFT JOIN students st ON st.id = r.student_id
+    WHERE r.grouping_id <> 2 OR r.student_rank <= 10
+    ORDER BY r.grouping_id, r.date DESC, r.student_rank
+"""
+
+# Fecha UTC de la entrega: la columna generada detected_date (con índice BRIN,
+# ver AdaptiveDatabaseDAO.ensure_detected_date_column) o el cálculo fila a fila
+_DETECTED_DATE_EXPR = "DATE(detected_at AT TIME ZONE 'UTC')"
+# Filtro extra para que las entregas recientes puedan usar el índice BRIN
+_DETECTED_DATE_FILTER = " AND sub.detected_date >= (%s::timestamptz AT TIME ZONE 'UTC')::date"
+
+# Valores de GROUPING(date, student_id) en SQL_SUBMISSION_STATS
+_GROUP_BY_DATE = 1
+_GROUP_BY_STUDENT = 2
+_GROUP_TOTAL = 3
+
+# Datos por módulo
+SQL_MODULES = """
+    SELECT 
+        m.code,
+        m.name as module_name,
+        COUNT(DISTINCT sub.student_id) as students_count,
+        COUNT(sub.id) as submissions_count,
+        MAX(sub.detected_at AT TIME ZONE 'UTC')::timestamp as last_submission,
+        m.drive_folder_url
+    FROM modules m
+    LEFT JOIN submissions sub ON m.id = sub.module_id
+    GROUP BY m.id, m.code, m.name, m.drive_folder_url
+    ORDER BY m.order_index
+"""
+
+# Datos por estudiante
+SQL_STUDENTS = """
+    SELECT 
+        s.full_name,
+        s.email,
+        COUNT(DISTINCT sub.module_id) as modules_completed,
+        COUNT(sub.id) as total_submissions,
+        MAX(sub.detected_at AT TIME ZONE 'UTC')::timestamp as last_activity,
+        MIN(sub.detected_at AT TIME ZONE 'UTC')::timestamp as first_activity
+    FROM students s
+    LEFT JOIN submissions sub ON s.id = sub.student_id
+    GROUP BY s.id, s.full_name, s.email
+    ORDER BY modules_completed DESC, s.full_name
+"""
+
+# Entregas recientes (con email para mejor contexto; el estado del email se calcula en pandas)
+SQL_RECENT_SUBMISSIONS = """
+    SELECT 
+        s.full_name as student_name,
+        s.email,
+        m.name as module_name,
+        sub.filename,
+        sub.file_extension,
+        sub.size_mb,
+        (sub.detected_at AT TIME ZONE 'UTC')::timestamp as detected_at,
+        sub.drive_url
+    FROM submissions sub
+    JOIN students s ON sub.student_id = s.id
+    JOIN modules m ON sub.module_id = m.id
+    WHERE sub.detected_at > %s{date_filter}
+    ORDER BY sub.detected_at DESC
+    LIMIT 100
+"""
+
+
+# Consultas que crecen con los datos: se leen con cursor de servidor (itersize filas por viaje)
+_STREAMED_QUERIES = frozenset({'modules', 'students', 'recent_submissions'})
+_STREAM_ITERSIZE = 1000
+
+
 class ExcelReportGenerator:
     def __init__(self):
-        self.dao = adaptive_dao
+        # El DAO conecta a la base al importarse: se carga recién al pedir datos
+        self._dao = None
+        
+        # Hojas del libro en curso por nombre; el lock serializa reportes simultáneos
+        self._worksheets = {}
+        self._run_lock = threading.Lock()
         
         # Colores de la academia (profesional)
         self.colors = {
@@ -32,9 +149,28 @@ class ExcelReportGenerator:
             'light': 'FFF3F4F6'  # Gris claro
         }
     
-    def generate_full_report(self, output_path: str = None, period_days: int = 30) -> str:
+    @property
+    def dao(self):
+        """DAO adaptativo compartido (importado en el primer uso)."""
+        if self._dao is None:
+            from app.db.adaptive_dao import adaptive_dao
+            self._dao = adaptive_dao
+        return self._dao
+    
+    def generate_full_report(self, output_path: str = None, period_days: int = 30,
+                             parquet_sidecars: bool = False) -> str:
         """
         Genera reporte Excel completo con múltiples hojas y gráficos.
+        
+        Las consultas se lanzan todas al principio y cada hoja se escribe en cuanto
+        llegan sus datos; las filas de una hoja se liberan al terminarla.
+        
+        Args:
+            output_path: Ruta del .xlsx (por defecto con fecha y hora)
+            period_days: Días hacia atrás de la actividad reciente
+            parquet_sidecars: Guardar también módulos, estudiantes y entregas como
+                <reporte>_<tabla>.parquet para consumo programático (requiere pyarrow;
+                desactivado por defecto). Un error al escribirlos no afecta al Excel.
         """
         try:
             logger.info(f"📊 Generando reporte Excel para últimos {period_days} días...")
@@ -44,33 +180,56 @@ class ExcelReportGenerator:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 output_path = f"reporte_jeanacademy_{timestamp}.xlsx"
             
-            # Obtener datos
-            data = self._fetch_report_data(period_days)
+            import xlsxwriter
             
-            # Crear Excel con xlsxwriter para más control
-            with pd.ExcelWriter(output_path, engine='xlsxwriter') as writer:
-                workbook = writer.book
-                
-                # Formatos globales
-                formats = self._create_formats(workbook)
-                
-                # 1. Hoja de Resumen Ejecutivo
-                self._create_summary_sheet(writer, data, formats)
-                
-                # 2. Hoja de Módulos
-                self._create_modules_sheet(writer, data, formats)
-                
-                # 3. Hoja de Estudiantes
-                self._create_students_sheet(writer, data, formats)
+            # Un reporte a la vez por generador: las hojas se registran en self._worksheets
+            with self._run_lock:
+                self._worksheets = {}
                 
-                # 4. Hoja de Entregas Detalladas
-                self._create_submissions_sheet(writer, data, formats)
-                
-                # 5. Hoja de Estadísticas
-                self._create_statistics_sheet(writer, data, formats)
-                
-                # Ajustar tamaños de columnas
-                self._adjust_column_widths(writer)
+                # Un hilo por consulta del reporte
+                with ThreadPoolExecutor(max_workers=4, thread_name_prefix='report-query') as executor:
+                    # Obtener datos (en paralelo, sin esperar)
+                    pending = self._submit_report_queries(executor, period_days)
+                    
+                    # Crear Excel directamente con xlsxwriter. constant_memory vuelca cada fila
+                    # a disco al pasar a la siguiente: cada hoja se escribe de arriba a abajo.
+                    workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True})
+                    try:
+                        # Formatos globales
+                        formats = self._create_formats(workbook)
+                        
+                        # 1. Hoja de Resumen Ejecutivo (resumen, top estudiantes y actividad diaria)
+                        data = _split_submission_stats(pending['submission_stats'].result())
+                        self._create_summary_sheet(workbook, data, formats)
+                        
+                        # 2. Hoja de Módulos
+                        data['modules'] = pending['modules'].result()
+                        if parquet_sidecars:
+                            _write_parquet_sidecar(output_path, 'modules', data['modules'])
+                        self._create_modules_sheet(workbook, data, formats)
+                        del data['modules']
+                        
+                        # 3. Hoja de Estudiantes
+                        data['students'] = pending['students'].result()
+                        if parquet_sidecars:
+                            _write_parquet_sidecar(output_path, 'students', data['students'])
+                        self._create_students_sheet(workbook, data, formats)
+                        del data['students']
+                        
+                        # 4. Hoja de Entregas Detalladas
+                        data['recent_submissions'] = pending['recent_submissions'].result()
+                        if parquet_sidecars:
+                            _write_parquet_sidecar(output_path, 'recent_submissions', data['recent_submissions'])
+                        self._create_submissions_sheet(workbook, data, formats)
+                        del data['recent_submissions']
+                        
+                        # 5. Hoja de Estadísticas
+                        self._create_statistics_sheet(workbook, data, formats)
+                        
+                        # Ajustar tamaños de columnas
+                        self._adjust_column_widths(workbook)
+                    finally:
+                        workbook.close()
             
             logger.info(f"✅ Reporte generado: {output_path}")
             return output_path
@@ -79,122 +238,61 @@ class ExcelReportGenerator:
             logger.error(f"❌ Error generando reporte Excel: {e}")
             raise
     
-    def _fetch_report_data(self, period_days: int) -> Dict:
-        """Obtiene todos los datos necesarios para el reporte."""
+    def _submit_report_queries(self, executor: ThreadPoolExecutor, period_days: int) -> Dict[str, Future]:
+        """
+        Lanza las consultas del reporte en el executor.
+        
+        Las consultas son independientes: cada una usa su propia conexión y el tiempo
+        total es el de la más lenta (psycopg2 libera el GIL mientras espera a Postgres).
+        
+        Returns:
+            Dict[str, Future]: Un future por consulta con la lista de filas
+        """
         logger.info("📥 Obteniendo datos de la base de datos...")
         
-        data = {}
+        # Fecha de corte
+        cutoff_date = datetime.now() - timedelta(days=period_days)
         
-        with self.dao.get_cursor() as cur:
-            # Fecha de corte
-            cutoff_date = datetime.now() - timedelta(days=period_days)
-            
-            # 1. Resumen general
-            cur.execute("""
-                SELECT 
-                    COUNT(DISTINCT m.id) as total_modules,
-                    COUNT(DISTINCT s.id) as total_students,
-                    COUNT(DISTINCT sub.id) as total_submissions,
-                    COUNT(DISTINCT CASE 
-                        WHEN sub.detected_at > %s THEN sub.student_id 
-                    END) as active_students
-                FROM modules m
-                LEFT JOIN submissions sub ON m.id = sub.module_id
-                LEFT JOIN students s ON sub.student_id = s.id
-            """, (cutoff_date,))
-            data['summary'] = cur.fetchone()
-            
-            # 2. Datos por módulo
-            cur.execute("""
-                SELECT 
-                    m.code,
-                    m.name as module_name,
-                    COUNT(DISTINCT sub.student_id) as students_count,
-                    COUNT(sub.id) as submissions_count,
-                    MAX(sub.detected_at AT TIME ZONE 'UTC')::timestamp as last_submission,
-                    m.drive_folder_url
-                FROM modules m
-                LEFT JOIN submissions sub ON m.id = sub.module_id
-                GROUP BY m.id, m.code, m.name, m.drive_folder_url
-                ORDER BY m.order_index
-            """)
-            data['modules'] = cur.fetchall()
-            
-            # 3. Datos por estudiante
-            cur.execute("""
-                SELECT 
-                    s.full_name,
-                    s.email,
-                    COUNT(DISTINCT sub.module_id) as modules_completed,
-                    COUNT(sub.id) as total_submissions,
-                    MAX(sub.detected_at AT TIME ZONE 'UTC')::timestamp as last_activity,
-                    MIN(sub.detected_at AT TIME ZONE 'UTC')::timestamp as first_activity
-                FROM students s
-                LEFT JOIN submissions sub ON s.id = sub.student_id
-                GROUP BY s.id, s.full_name, s.email
-                ORDER BY modules_completed DESC, s.full_name
-            """)
-            data['students'] = cur.fetchall()
-            
-            # 4. Entregas recientes (con email para mejor contexto)
-            cur.execute("""
-                SELECT 
-                    s.full_name as student_name,
-                    s.email,
-                    m.name as module_name,
-                    sub.filename,
-                    sub.file_extension,
-                    sub.size_mb,
-                    (sub.detected_at AT TIME ZONE 'UTC')::timestamp as detected_at,
-                    sub.drive_url,
-                    CASE 
-                        WHEN s.email LIKE '%%@gmail.com' THEN '✅ Gmail'
-                        WHEN s.email LIKE '%%.temp' THEN '⚠️ Temporal'
-                        WHEN s.email LIKE '%%@%%' THEN '✅ Email real'
-                        ELSE '❓ Revisar'
-                    END as email_status
-                FROM submissions sub
-                JOIN students s ON sub.student_id = s.id
-                JOIN modules m ON sub.module_id = m.id
-                WHERE sub.detected_at > %s
-                ORDER BY sub.detected_at DESC
-                LIMIT 100
-            """, (cutoff_date,))
-            data['recent_submissions'] = cur.fetchall()
-            
-            # 5. Estadísticas por día
-            cur.execute("""
-                SELECT 
-                    DATE(detected_at AT TIME ZONE 'UTC') as date,
-                    COUNT(*) as submissions,
-                    COUNT(DISTINCT student_id) as active_students
-                FROM submissions
-                WHERE detected_at > %s
-                GROUP BY DATE(detected_at AT TIME ZONE 'UTC')
-                ORDER BY date DESC
-            """, (cutoff_date,))
-            data['daily_stats'] = cur.fetchall()
-            
-            # 6. Top estudiantes más activos
-            cur.execute("""
-                SELECT 
-                    s.full_name,
-                    COUNT(sub.id) as submissions
-                FROM students s
-                JOIN submissions sub ON s.id = sub.student_id
-                WHERE sub.detected_at > %s
-                GROUP BY s.id, s.full_name
-                ORDER BY submissions DESC
-                LIMIT 10
-            """, (cutoff_date,))
-            data['top_students'] = cur.fetchall()
-            
+        dao = self.dao
+        
+        # Usar detected_date si la migración ya se aplicó (python -m app.main_job migrate)
+        if dao.has_column('submissions', 'detected_date'):
+            sql_stats = SQL_SUBMISSION_STATS.format(date_expr='detected_date')
+            sql_recent = SQL_RECENT_SUBMISSIONS.format(date_filter=_DETECTED_DATE_FILTER)
+            recent_params = (cutoff_date, cutoff_date)
+        else:
+            sql_stats = SQL_SUBMISSION_STATS.format(date_expr=_DETECTED_DATE_EXPR)
+            sql_recent = SQL_RECENT_SUBMISSIONS.format(date_filter='')
+            recent_params = (cutoff_date,)
+        
+        queries = {
+            'submission_stats': (sql_stats, (cutoff_date,)),
+            'modules': (SQL_MODULES, None),
+            'students': (SQL_STUDENTS, None),
+            'recent_submissions': (sql_recent, recent_params),
+        }
         
-        logger.info(f"✅ Datos obtenidos: {len(data)} conjuntos")
-        return data
+        from psycopg2.extras import NamedTupleCursor
+        
+        def run_query(key: str, sql: str, params: Optional[tuple]) -> List:
+            # Las consultas sin límite de filas se leen con cursor de servidor por bloques,
+            # con una namedtuple por fila en lugar de un dict
+            if key in _STREAMED_QUERIES:
+                name, cursor_factory = f"report_{key}", NamedTupleCursor
+            else:
+                name, cursor_factory = None, None
+            with dao.get_cursor(name=name, itersize=_STREAM_ITERSIZE,
+                                cursor_factory=cursor_factory) as cur:
+                cur.execute(sql, params)
+                rows = list(cur) if name else cur.fetchall()
+            logger.info(f"✅ Datos obtenidos: {key} ({len(rows)} filas)")
+            return rows
+        
+        return {key: executor.submit(run_query, key, sql, params)
+                for key, (sql, params) in queries.items()}
     
     def _create_formats(self, workbook) -> Dict:
-        """Crea formatos reutilizables para el Excel."""
+        """Crea formatos reutilizables para el Excel (una vez por libro)."""
         return {
             'title': workbook.add_format({
                 'font_size': 20,
@@ -263,47 +361,56 @@ class ExcelReportGenerator:
                 'bold': True,
                 'border': 1,
                 'align': 'center'
-            })
+            }),
+            # Cards de métricas del resumen: un formato por color
+            'cards': {
+                color: workbook.add_format({
+                    'bg_color': color,
+                    'font_color': 'white',
+                    'bold': True,
+                    'border': 2,
+                    'align': 'center',
+                    'valign': 'vcenter',
+                    'font_size': 12
+                })
+                for color in (self.colors['header'], self.colors['subheader'],
+                              self.colors['success'], self.colors['accent'])
+            }
         }
     
-    def _create_summary_sheet(self, writer, data: Dict, formats: Dict):
+    def _create_summary_sheet(self, workbook, data: Dict, formats: Dict):
         """Crea hoja de resumen ejecutivo con KPIs."""
-        df_summary = pd.DataFrame([data['summary']])
-        df_summary.to_excel(writer, sheet_name='Resumen', index=False, startrow=5)
-        
-        worksheet = writer.sheets['Resumen']
-        workbook = writer.book
+        worksheet = self._add_worksheet(workbook, 'Resumen')
         
         # Título
         worksheet.merge_range('A1:F2', '🎓 REPORTE ACADÉMICO - JEAN ACADEMY', formats['title'])
         worksheet.merge_range('A3:F3', f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}", formats['subtitle'])
         
+        # Tabla de totales
+        summary = data['summary']
+        worksheet.write_row(5, 0, list(summary.keys()), formats['header'])
+        worksheet.write_row(6, 0, [value or 0 for value in summary.values()], formats['number'])
+        
         # KPIs principales
         row = 7
         col = 0
         
         # Cards de métricas
         metrics = [
-            ('Total Módulos', data['summary']['total_modules'], self.colors['header']),
-            ('Total Estudiantes', data['summary']['total_students'], self.colors['subheader']),
-            ('Total Entregas', data['summary']['total_submissions'], self.colors['success']),
-            ('Estudiantes Activos', data['summary']['active_students'], self.colors['accent'])
+            ('Total Módulos', summary['total_modules'], self.colors['header']),
+            ('Total Estudiantes', summary['total_students'], self.colors['subheader']),
+            ('Total Entregas', summary['total_submissions'], self.colors['success']),
+            ('Estudiantes Activos', summary['active_students'], self.colors['accent'])
         ]
         
-        for i, (label, value, color) in enumerate(metrics):
-            card_format = workbook.add_format({
-                'bg_color': color,
-                'font_color': 'white',
-                'bold': True,
-                'border': 2,
-                'align': 'center',
-                'valign': 'vcenter',
-                'font_size': 12
-            })
-            
-            worksheet.merge_range(row, col + i*2, row+1, col + i*2 + 1, '', card_format)
-            worksheet.write(row, col + i*2, label, card_format)
-            worksheet.write(row+1, col + i*2, value or 0, card_format)
+        card_formats = formats['cards']
+        
+        # Cada card ocupa dos columnas: fila de etiquetas y luego fila de valores
+        # (constant_memory no permite volver a una fila ya escrita)
+        for i, (label, _, color) in enumerate(metrics):
+            worksheet.merge_range(row, col + i*2, row, col + i*2 + 1, label, card_formats[color])
+        for i, (_, value, color) in enumerate(metrics):
+            worksheet.merge_range(row + 1, col + i*2, row + 1, col + i*2 + 1, value or 0, card_formats[color])
         
         # Gráfico de estudiantes más activos
         if data['top_students']:
@@ -311,9 +418,11 @@ class ExcelReportGenerator:
             worksheet.write(row, 0, 'Top 10 Estudiantes Más Activos', formats['subtitle'])
             
             row += 2
-            for i, student in enumerate(data['top_students']):
-                worksheet.write(row + i, 0, student['full_name'], formats['cell'])
-                worksheet.write(row + i, 1, student['submissions'], formats['number'])
+            top_students = pd.DataFrame(data['top_students'], columns=['full_name', 'submissions'])
+            _write_block(worksheet, top_students.to_numpy(dtype=object), row, [
+                ('text', formats['cell'], None),
+                ('number', formats['number'], None)
+            ])
             
             # Crear gráfico de barras
             chart = workbook.add_chart({'type': 'bar'})
@@ -328,45 +437,39 @@ class ExcelReportGenerator:
             chart.set_y_axis({'name': 'Número de Entregas'})
             worksheet.insert_chart('D14', chart)
     
-    def _create_modules_sheet(self, writer, data: Dict, formats: Dict):
+    def _create_modules_sheet(self, workbook, data: Dict, formats: Dict):
         """Crea hoja con detalle de módulos."""
         if data['modules']:
-            df_modules = pd.DataFrame(data['modules'])
+            df_modules = _rows_to_frame(data['modules'])
             
             # Renombrar columnas para mejor presentación
             df_modules.columns = ['Código', 'Módulo', 'Estudiantes', 'Entregas', 'Última Actividad', 'URL Drive']
             
-            # Escribir datos
-            df_modules.to_excel(writer, sheet_name='Módulos', index=False, startrow=3)
+            # Fechas como número de serie de Excel, calculadas para toda la columna (NaN = sin actividad)
+            df_modules['Última Actividad'] = _excel_serials(df_modules['Última Actividad'])
             
-            worksheet = writer.sheets['Módulos']
+            worksheet = self._add_worksheet(workbook, 'Módulos')
             
             # Título
             worksheet.merge_range('A1:F2', '📚 DETALLE DE MÓDULOS', formats['title'])
             
-            # Formato de encabezados
-            for col_num, col_name in enumerate(df_modules.columns):
-                worksheet.write(3, col_num, col_name, formats['header'])
-            
-            # Formato de datos
-            for row_num in range(len(df_modules)):
-                for col_num in range(len(df_modules.columns)):
-                    value = df_modules.iloc[row_num, col_num]
-                    
-                    if col_num in [2, 3]:  # Números
-                        worksheet.write(row_num + 4, col_num, value or 0, formats['number'])
-                    elif col_num == 4:  # Fecha
-                        if value and pd.notna(value):
-                            worksheet.write_datetime(row_num + 4, col_num, value, formats['datetime'])
-                        else:
-                            worksheet.write(row_num + 4, col_num, 'Sin actividad', formats['cell'])
-                    else:
-                        worksheet.write(row_num + 4, col_num, value or '', formats['cell'])
+            # Encabezados
+            worksheet.write_row(3, 0, df_modules.columns, formats['header'])
+            
+            # Datos
+            _write_block(worksheet, df_modules.to_numpy(), 4, [
+                ('text', formats['cell'], None),
+                ('text', formats['cell'], None),
+                ('number', formats['number'], None),
+                ('number', formats['number'], None),
+                ('serial', formats['datetime'], ('Sin actividad', formats['cell'])),
+                ('text', formats['cell'], None)
+            ])
     
-    def _create_students_sheet(self, writer, data: Dict, formats: Dict):
+    def _create_students_sheet(self, workbook, data: Dict, formats: Dict):
         """Crea hoja con detalle de estudiantes."""
         if data['students']:
-            df_students = pd.DataFrame(data['students'])
+            df_students = _rows_to_frame(data['students'])
             
             # Renombrar columnas
             df_students.columns = ['Nombre', 'Email', 'Módulos Completados', 'Total Entregas', 
@@ -374,70 +477,68 @@ class ExcelReportGenerator:
             
             # Calcular progreso
             total_modules = data['summary']['total_modules'] or 1
-            df_students['Progreso %'] = (df_students['Módulos Completados'] / total_modules * 100).round(1)
+            progress = (df_students['Módulos Completados'] / total_modules * 100).round(1)
+            
+            # Formato según progreso calculado para todas las filas a la vez
+            bucket = np.select([progress >= 80, progress >= 50], [0, 1], default=2)
+            progress_formats = np.array([formats['success'], formats['warning'], formats['danger']],
+                                        dtype=object)[bucket]
+            df_students['Progreso %'] = progress.astype(str) + '%'
             
-            # Escribir datos
-            df_students.to_excel(writer, sheet_name='Estudiantes', index=False, startrow=3)
+            # Fechas como número de serie de Excel (NaN = N/A)
+            for column in ('Última Actividad', 'Primera Actividad'):
+                df_students[column] = _excel_serials(df_students[column])
             
-            worksheet = writer.sheets['Estudiantes']
+            worksheet = self._add_worksheet(workbook, 'Estudiantes')
             
             # Título
             worksheet.merge_range('A1:G2', '👥 DETALLE DE ESTUDIANTES', formats['title'])
             
-            # Formato de encabezados
-            for col_num, col_name in enumerate(df_students.columns):
-                worksheet.write(3, col_num, col_name, formats['header'])
-            
-            # Formato de datos con colores según progreso
-            for row_num in range(len(df_students)):
-                progress = df_students.iloc[row_num, 6]  # Columna de Progreso %
-                
-                # Determinar formato según progreso
-                if progress >= 80:
-                    progress_format = formats['success']
-                elif progress >= 50:
-                    progress_format = formats['warning']
-                else:
-                    progress_format = formats['danger']
-                
-                for col_num in range(len(df_students.columns)):
-                    value = df_students.iloc[row_num, col_num]
-                    
-                    if col_num in [2, 3]:  # Números
-                        worksheet.write(row_num + 4, col_num, value or 0, formats['number'])
-                    elif col_num in [4, 5]:  # Fechas
-                        if value and pd.notna(value):
-                            worksheet.write_datetime(row_num + 4, col_num, value, formats['datetime'])
-                        else:
-                            worksheet.write(row_num + 4, col_num, 'N/A', formats['cell'])
-                    elif col_num == 6:  # Progreso
-                        worksheet.write(row_num + 4, col_num, f"{value}%", progress_format)
-                    else:
-                        worksheet.write(row_num + 4, col_num, value or '', formats['cell'])
+            # Encabezados
+            worksheet.write_row(3, 0, df_students.columns, formats['header'])
+            
+            # Datos
+            _write_block(worksheet, df_students.to_numpy(), 4, [
+                ('text', formats['cell'], None),
+                ('text', formats['cell'], None),
+                ('number', formats['number'], None),
+                ('number', formats['number'], None),
+                ('serial', formats['datetime'], ('N/A', formats['cell'])),
+                ('serial', formats['datetime'], ('N/A', formats['cell'])),
+                ('per_row', progress_formats, None)
+            ])
     
-    def _create_submissions_sheet(self, writer, data: Dict, formats: Dict):
+    def _create_submissions_sheet(self, workbook, data: Dict, formats: Dict):
         """Crea hoja con entregas recientes."""
         if data['recent_submissions']:
-            df_submissions = pd.DataFrame(data['recent_submissions'])
+            df_submissions = _rows_to_frame(data['recent_submissions'])
             
             # Renombrar columnas (ahora incluye email y estado del email)
             df_submissions.columns = ['Estudiante', 'Email', 'Módulo', 'Archivo', 'Tipo', 
-                                     'Tamaño (MB)', 'Fecha Detección', 'URL Drive', 'Estado Email']
-            
-            df_submissions.to_excel(writer, sheet_name='Entregas Recientes', index=False, startrow=3)
+                                     'Tamaño (MB)', 'Fecha Detección', 'URL Drive']
+            df_submissions['Estado Email'] = _email_status(df_submissions['Email'])
+            df_submissions['Fecha Detección'] = _excel_serials(df_submissions['Fecha Detección'])
             
-            worksheet = writer.sheets['Entregas Recientes']
+            worksheet = self._add_worksheet(workbook, 'Entregas Recientes')
             
             # Título (ahora hasta columna I por las 9 columnas)
             worksheet.merge_range('A1:I2', '📝 ENTREGAS RECIENTES', formats['title'])
             
-            # Formato de encabezados
-            for col_num, col_name in enumerate(df_submissions.columns):
-                worksheet.write(3, col_num, col_name, formats['header'])
+            # Encabezados
+            worksheet.write_row(3, 0, df_submissions.columns, formats['header'])
+            
+            # Datos
+            cell = ('text', formats['cell'], None)
+            _write_block(worksheet, df_submissions.to_numpy(), 4, [
+                cell, cell, cell, cell, cell,
+                ('raw', formats['cell'], None),
+                ('serial', formats['datetime'], None),
+                cell, cell
+            ])
     
-    def _create_statistics_sheet(self, writer, data: Dict, formats: Dict):
+    def _create_statistics_sheet(self, workbook, data: Dict, formats: Dict):
         """Crea hoja con estadísticas y gráficos."""
-        worksheet = writer.book.add_worksheet('Estadísticas')
+        worksheet = self._add_worksheet(workbook, 'Estadísticas')
         
         # Título
         worksheet.merge_range('A1:H2', '📈 ESTADÍSTICAS Y TENDENCIAS', formats['title'])
@@ -448,17 +549,18 @@ class ExcelReportGenerator:
             worksheet.write(row, 0, 'Actividad Diaria', formats['subtitle'])
             
             row += 2
-            worksheet.write(row, 0, 'Fecha', formats['header'])
-            worksheet.write(row, 1, 'Entregas', formats['header'])
-            worksheet.write(row, 2, 'Estudiantes Activos', formats['header'])
+            worksheet.write_row(row, 0, ('Fecha', 'Entregas', 'Estudiantes Activos'), formats['header'])
             
-            for i, day_stat in enumerate(data['daily_stats']):
-                worksheet.write(row + i + 1, 0, day_stat['date'], formats['date'])
-                worksheet.write(row + i + 1, 1, day_stat['submissions'], formats['number'])
-                worksheet.write(row + i + 1, 2, day_stat['active_students'], formats['number'])
+            daily_stats = pd.DataFrame(data['daily_stats'], columns=['date', 'submissions', 'active_students'])
+            daily_stats['date'] = _excel_serials(daily_stats['date'])
+            _write_block(worksheet, daily_stats.to_numpy(dtype=object), row + 1, [
+                ('serial', formats['date'], None),
+                ('number', formats['number'], None),
+                ('number', formats['number'], None)
+            ])
             
             # Gráfico de líneas para actividad
-            chart = writer.book.add_chart({'type': 'line'})
+            chart = workbook.add_chart({'type': 'line'})
             chart.add_series({
                 'name': 'Entregas',
                 'categories': ['Estadísticas', row + 1, 0, row + len(data['daily_stats']), 0],
@@ -476,10 +578,15 @@ class ExcelReportGenerator:
             chart.set_y_axis({'name': 'Cantidad'})
             worksheet.insert_chart('E6', chart, {'x_scale': 1.5, 'y_scale': 1.5})
     
-    def _adjust_column_widths(self, writer):
+    def _add_worksheet(self, workbook, name: str):
+        """Crea una hoja y guarda su referencia en self._worksheets."""
+        worksheet = workbook.add_worksheet(name)
+        self._worksheets[name] = worksheet
+        return worksheet
+    
+    def _adjust_column_widths(self, workbook):
         """Ajusta anchos de columna para mejor visualización."""
-        for sheet_name in writer.sheets:
-            worksheet = writer.sheets[sheet_name]
+        for worksheet in self._worksheets.values():
             
             # Anchos estándar por tipo de columna
             column_widths = {
@@ -497,6 +604,171 @@ class ExcelReportGenerator:
                 worksheet.set_column(f'{col}:{col}', width)
 
 
+def _split_submission_stats(rows: List) -> Dict:
+    """
+    Reparte las filas de SQL_SUBMISSION_STATS según su GROUPING().
+    
+    Returns:
+        Dict: 'summary', 'daily_stats' y 'top_students' con las mismas claves
+        que usan las hojas del reporte
+    """
+    data = {'summary': None, 'daily_stats': [], 'top_students': []}
+    
+    for row in rows:
+        grouping_id = row['grouping_id']
+        if grouping_id == _GROUP_TOTAL:
+            data['summary'] = {
+                'total_modules': row['total_modules'],
+                'total_students': row['students'],
+                'total_submissions': row['submissions'],
+                'active_students': row['active_students']
+            }
+        elif grouping_id == _GROUP_BY_DATE:
+            data['daily_stats'].append({
+                'date': row['date'],
+                'submissions': row['recent_submissions'],
+                'active_students': row['active_students']
+            })
+        elif grouping_id == _GROUP_BY_STUDENT:
+            data['top_students'].append({
+                'full_name': row['full_name'],
+                'submissions': row['recent_submissions']
+            })
+    
+    return data
+
+
+def _write_parquet_sidecar(output_path: str, name: str, rows: List[tuple]) -> Optional[str]:
+    """
+    Guarda las filas de una consulta como Parquet (zstd) junto al Excel.
+    
+    Las columnas conservan los nombres y tipos de la consulta. Sin pyarrow o sin
+    filas no se escribe nada. Si pyarrow no puede convertir las filas (tipos
+    mezclados, columnas raras) se registra un warning y se sigue: el sidecar es
+    opcional y no debe tumbar el reporte.
+    
+    Returns:
+        Optional[str]: Ruta del .parquet escrito
+    """
+    if pa is None or not rows:
+        return None
+    
+    import pyarrow.parquet as pq
+    
+    path = f"{os.path.splitext(output_path)[0]}_{name}.parquet"
+    try:
+        pq.write_table(_rows_to_table(rows), path, compression='zstd')
+    except (pa.ArrowException, OSError, ValueError, TypeError) as e:
+        logger.warning(f"⚠️ No se pudo guardar el Parquet de '{name}': {e}")
+        return None
+    logger.info(f"💾 Parquet guardado: {path}")
+    return path
+
+
+def _rows_to_table(rows: List[tuple]):
+    """Convierte filas namedtuple del cursor en una tabla de pyarrow, columna a columna."""
+    columns = zip(*rows)
+    return pa.Table.from_arrays([pa.array(column) for column in columns], names=list(rows[0]._fields))
+
+
+def _rows_to_frame(rows: List[tuple]) -> pd.DataFrame:
+    """
+    Convierte las filas namedtuple del cursor en DataFrame.
+    
+    Con pyarrow las columnas se construyen en formato columnar (enteros y fechas
+    sin pasar por objetos Python); to_pandas devuelve columnas numpy normales para
+    que el resto del reporte no cambie. Sin pyarrow pandas usa su camino rápido
+    para tuplas.
+    """
+    if pa is not None:
+        return _rows_to_table(rows).to_pandas()
+    return pd.DataFrame(rows, columns=rows[0]._fields)
+
+
+
+def _write_block(worksheet, arr: np.ndarray, start_row: int, columns: List[tuple]):
+    """
+    Escribe un bloque de filas (ndarray ya materializado) con un formato por columna.
+    
+    Se escribe fila a fila, como exige constant_memory; las columnas contiguas de
+    texto o número con el mismo formato se agrupan en un único write_row por fila.
+    
+    Args:
+        worksheet: Hoja de xlsxwriter
+        arr: Datos (una fila del array por fila de Excel)
+        start_row: Primera fila de Excel a escribir
+        columns: Una tupla (tipo, formato, extra) por columna:
+            'text'    -> valor ('' si falta) con el formato
+            'number'  -> valor (0 si falta) con el formato
+            'raw'     -> valor tal cual (celda vacía si falta)
+            'serial'  -> fecha como número de serie de Excel; si es NaN escribe
+                         extra = (texto, formato) o deja la celda vacía
+            'per_row' -> formato es una secuencia con el formato de cada fila
+    """
+    # Agrupar columnas contiguas del mismo tipo y formato: [tipo, primera, fin, formato, extra]
+    runs = []
+    for col, (kind, fmt, extra) in enumerate(columns):
+        last = runs[-1] if runs else None
+        if last and kind in ('text', 'number') and last[0] == kind and last[3] is fmt and last[2] == col:
+            last[2] = col + 1
+        else:
+            runs.append([kind, col, col + 1, fmt, extra])
+    
+    write_row = worksheet.write_row
+    for i, row in enumerate(arr):
+        row_num = start_row + i
+        for kind, first, end, fmt, extra in runs:
+            if kind == 'text':
+                write_row(row_num, first, ['' if pd.isna(value) else value for value in row[first:end]], fmt)
+            elif kind == 'number':
+                write_row(row_num, first, [0 if pd.isna(value) else value for value in row[first:end]], fmt)
+            elif kind == 'serial':
+                value = row[first]
+                if not np.isnan(value):
+                    worksheet.write_number(row_num, first, value, fmt)
+                elif extra:
+                    worksheet.write_string(row_num, first, extra[0], extra[1])
+                else:
+                    worksheet.write_blank(row_num, first, None, fmt)
+            elif kind == 'per_row':
+                worksheet.write(row_num, first, row[first], fmt[i])
+            else:
+                value = row[first]
+                worksheet.write(row_num, first, None if pd.isna(value) else value, fmt)
+
+
+# Estados de email en orden de prioridad (el primero que se cumple gana)
+_EMAIL_STATUSES = ['✅ Gmail', '⚠️ Temporal', '✅ Email real']
+_EMAIL_STATUS_DEFAULT = '❓ Revisar'
+
+
+def _email_status(emails: pd.Series) -> pd.Categorical:
+    """Clasifica los emails de una columna completa sin recorrerla fila a fila."""
+    emails = emails.fillna('').astype(str)
+    conditions = [
+        emails.str.endswith('@gmail.com').to_numpy(),
+        emails.str.endswith('.temp').to_numpy(),
+        emails.str.contains('@', regex=False).to_numpy()
+    ]
+    status = np.select(conditions, _EMAIL_STATUSES, default=_EMAIL_STATUS_DEFAULT)
+    return pd.Categorical(status, categories=_EMAIL_STATUSES + [_EMAIL_STATUS_DEFAULT])
+
+
+# Día 0 de Excel (sistema 1900): los números de serie son días desde esta fecha
+_EXCEL_EPOCH = pd.Timestamp('1899-12-30')
+
+
+def _excel_serials(column: pd.Series) -> np.ndarray:
+    """
+    Convierte una columna de fechas a números de serie de Excel en una sola operación.
+    
+    Excel guarda las fechas como días (con fracción) desde 1899-12-30, así que se
+    escriben con write_number y el formato de fecha; NaT queda como NaN.
+    """
+    days = (pd.to_datetime(column) - _EXCEL_EPOCH) / pd.Timedelta(days=1)
+    return days.to_numpy(dtype=float, na_value=np.nan)
+
+
 def test_excel_report():
     """Función de prueba para generar reporte Excel."""
     try:
@@ -524,5 +796,9 @@ def test_excel_report():
 
 
 if __name__ == "__main__":
+    # Permite ejecutar el archivo directamente (python app/reports/excel_report.py)
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+    
     logging.basicConfig(level=logging.INFO)
     test_excel_report()
\ No newline at end of file
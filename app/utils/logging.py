@@ -1,7 +1,10 @@
 """
 Sistema de logging para la aplicación
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -15,19 +18,32 @@ log_dir.mkdir(exist_ok=True)
 log_format = "%(asctime)s | %(levelname)-8s | %(name)-20s | %(message)s"
 date_format = "%Y-%m-%d %H:%M:%S"
 
-# Configurar handler para archivo
+# Configurar handler para archivo (rota a los 50 MB, guarda 5 copias)
 log_file = log_dir / f"app_{datetime.now().strftime('%Y%m%d')}.log"
-file_handler = logging.FileHandler(log_file, encoding='utf-8')
+file_handler = logging.handlers.RotatingFileHandler(
+    log_file, maxBytes=50_000_000, backupCount=5, encoding='utf-8'
+)
 file_handler.setFormatter(logging.Formatter(log_format, date_format))
 
 # Configurar handler para consola
 console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setFormatter(logging.Formatter(log_format, date_format))
 
+# Los loggers solo encolan el registro; un hilo aparte (QueueListener) escribe
+# en archivo y consola, así el código que loguea no espera por la E/S
+log_queue = queue.SimpleQueue()
+queue_handler = logging.handlers.QueueHandler(log_queue)
+listener = logging.handlers.QueueListener(
+    log_queue, file_handler, console_handler, respect_handler_level=True
+)
+listener.start()
+# Al salir se vacía la cola antes de cerrar
+atexit.register(listener.stop)
+
 # Configurar logger principal
 logging.basicConfig(
     level=getattr(logging, config.LOG_LEVEL),
-    handlers=[file_handler, console_handler]
+    handlers=[queue_handler]
 )
 
 # Logger principal de la aplicación
@@ -0,0 +1,671 @@
+#!/usr/bin/env python3
+"""
+LÓGICA COMÚN DE CONSTRUCCIÓN DEL EJECUTABLE
+Usada por build_for_jean.py (target "native") y build_windows.py (target "windows")
+"""
+
+import os
+import sys
+import json
+import subprocess
+import shutil
+import platform
+import re
+import hashlib
+import zipfile
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import fcntl  # No existe en Windows
+except ImportError:
+    fcntl = None
+
+# ioctl de Linux para clonar un archivo por copy-on-write (XFS/Btrfs)
+FICLONE = 0x40049409
+
+# Sistema y hora del build: se calculan una sola vez por ejecución
+SYSTEM = platform.system()
+BUILD_TIME = datetime.now()
+BUILD_TIMESTAMP = BUILD_TIME.strftime('%Y-%m-%d %H:%M:%S')
+
+CREDENTIALS_FILE = "jeanacademy-da03c7c92e89.json"
+MANIFEST_NAME = ".manifest.json"
+
+# Líneas de PyInstaller que se muestran como progreso (una sola pasada por línea)
+PROGRESS_PATTERN = re.compile(r"Building|Copying|WARNING")
+
+# Binarios empaquetados por PyInstaller: ya vienen comprimidos, no vale la pena recomprimirlos
+STORED_SUFFIXES = (".exe", ".dll", ".pyd", ".so", ".dylib", ".zip")
+
+# Módulos que PyInstaller arrastra por dependencias opcionales y la app no usa
+EXCLUDED_MODULES = [
+    "tests",
+    "pytest",
+    "matplotlib",
+    "IPython",
+    "sqlalchemy",
+    "numpy.testing",
+    "setuptools",
+    "pip",
+    "pyarrow",  # opcional: si está instalado en el entorno de build no debe ir al ejecutable
+]
+
+NATIVE_INSTRUCTIONS = """🎨 ACADEMIA JEAN - SISTEMA DE REPORTES
+=============================================
+
+✅ INSTRUCCIONES DE USO:
+
+1. EJECUTAR:
+   - Doble-click en el archivo ejecutable
+   - Sistema: {system}
+
+2. USAR:
+   - Botón 1: "Rastrear Google Drive"
+   - Botón 2: "Generar Reporte Excel"
+
+3. ¡LISTO!
+   - El Excel se genera automáticamente
+   - Contiene todas las estadísticas de entregas
+
+📞 SOPORTE:
+   Email: darmcastiblanco@gmail.com
+   Proyecto: Academia Jean €250
+
+📅 Generado: {timestamp}
+🖥️ Sistema: {system}
+"""
+
+WINDOWS_INSTRUCTIONS = """🎨 ACADEMIA JEAN - SISTEMA DE REPORTES
+=============================================
+VERSIÓN WINDOWS
+
+✅ INSTRUCCIONES DE USO:
+
+1. EJECUTAR:
+   - Doble-click en {exe_name}.exe
+   - Si Windows bloquea, click en "Más información" → "Ejecutar de todos modos"
+
+2. CONFIGURACIÓN INICIAL:
+   - El programa solicitará el ID de la carpeta Google Drive
+   - Pegar el ID de tu carpeta de módulos
+
+3. USAR:
+   - Botón 1: "Rastrear Google Drive" - Verifica conexión
+   - Botón 2: "Generar Reporte Excel" - Crea el reporte
+
+4. CREDENCIALES:
+   ⚠️ IMPORTANTE: Reemplazar jeanacademy-da03c7c92e89.json con TUS credenciales
+   - Obtener desde Google Cloud Console
+   - Crear Service Account con permisos de lectura
+   - Descargar JSON y reemplazar el archivo incluido
+
+📊 CARACTERÍSTICAS:
+   - Terminal integrada con logs en tiempo real
+   - Genera reportes Excel profesionales
+   - Sistema dinámico que se adapta a cualquier carpeta
+
+📞 SOPORTE:
+   Email: darmcastiblanco@gmail.com
+   Proyecto: Academia Jean €250
+
+📅 Generado: {timestamp}
+🖥️ Sistema: Windows
+"""
+
+def native_exe_name():
+    """Nombre y modo de ventana del ejecutable según el sistema actual"""
+    if SYSTEM == "Windows":
+        return "AcademiaJean_Windows", "--windowed"
+    elif SYSTEM == "Darwin":  # macOS
+        return "AcademiaJean_macOS", "--windowed"
+    else:  # Linux
+        return "AcademiaJean_Linux", "--console"  # En Linux mejor con consola
+
+_native_name, _native_windowed = native_exe_name()
+
+# Configuración de cada target: lo único que cambia entre los dos scripts
+TARGETS = {
+    "native": {
+        "banner": "🎨 CONSTRUIR EJECUTABLE PARA ACADEMIA JEAN",
+        "label": "",
+        "exe_name": _native_name,
+        "exe_extension": ".exe" if SYSTEM == "Windows" else "",
+        "windowed_flag": _native_windowed,
+        "extra_args": [],
+        "distpath": "jean_executables",
+        "delivery_prefix": "academia_jean_entrega_",
+        "credentials_note": "Credenciales Google",
+        "instructions_file": "INSTRUCCIONES.txt",
+        "instructions": NATIVE_INSTRUCTIONS,
+        "email_subject": "Academia Jean - Sistema de Reportes €250",
+        "notes_title": "💡 PRÓXIMOS PASOS:",
+        "notes": [
+            "Probar el ejecutable localmente",
+            "Enviar ZIP por email a Jean",
+            "¡Disfrutar del pago! 💰",
+        ],
+        "closing": None,
+    },
+    "windows": {
+        "banner": "🪟 CONSTRUIR EJECUTABLE WINDOWS PARA ACADEMIA JEAN",
+        "label": " PARA WINDOWS",
+        "exe_name": "AcademiaJean",
+        "exe_extension": ".exe",
+        "windowed_flag": "--windowed",  # Sin consola (GUI)
+        "extra_args": [
+            "--icon", "NONE",           # Sin icono por ahora
+            "--hidden-import", "tkinter",
+        ],
+        "distpath": "dist_windows",
+        "delivery_prefix": "AcademiaJean_Windows_",
+        "credentials_note": "Credenciales Google (reemplazar con las de Jean)",
+        "instructions_file": "INSTRUCCIONES_WINDOWS.txt",
+        "instructions": WINDOWS_INSTRUCTIONS,
+        "email_subject": "Academia Jean - Sistema de Reportes Windows €250",
+        "notes_title": "💡 NOTAS IMPORTANTES:",
+        "notes": [
+            "Este ejecutable funciona en Windows 7/8/10/11",
+            "Jean debe reemplazar las credenciales con las suyas",
+            "El sistema se adapta dinámicamente a cualquier carpeta",
+        ],
+        "closing": "🚀 ¡Ejecutable Windows listo para Jean!",
+    },
+}
+
+def print_step(message):
+    """Imprime paso con formato"""
+    print(f"\n🔨 {message}")
+    print("=" * 60)
+
+def dependencies_satisfied():
+    """Comprueba sin llamar a pip si requirements.txt y PyInstaller ya están instalados"""
+    try:
+        from packaging.requirements import InvalidRequirement, Requirement
+    except ImportError:
+        # Sin packaging no se pueden comparar versiones: instalar con pip
+        return False
+    from importlib import metadata, util
+
+    if util.find_spec("PyInstaller") is None:
+        return False
+
+    with open("requirements.txt", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            try:
+                req = Requirement(line)
+            except InvalidRequirement:
+                return False
+            if req.marker and not req.marker.evaluate():
+                continue
+            try:
+                version = metadata.version(req.name)
+            except metadata.PackageNotFoundError:
+                return False
+            if not req.specifier.contains(version, prereleases=True):
+                return False
+
+    return True
+
+def pip_cache_args():
+    """Argumentos de pip para reutilizar la caché de wheels entre builds"""
+    # En CI se puede fijar PIP_CACHE_DIR para apuntar a la caché persistente
+    cache_dir = os.environ.get("PIP_CACHE_DIR") or os.path.expanduser("~/.cache/jeanacademy-pip")
+    os.makedirs(cache_dir, exist_ok=True)
+    return ["--cache-dir", cache_dir, "--prefer-binary"]
+
+def pip_install_command():
+    """Comando de instalación: uv (resolver e instalador nativos, mucho más rápido) si está, si no pip"""
+    uv = shutil.which("uv")
+    if uv:
+        # --python apunta al intérprete actual, esté o no dentro de un venv
+        return [uv, "pip", "install", "--python", sys.executable]
+    return [sys.executable, "-m", "pip", "install", *pip_cache_args()]
+
+def build_inputs_hash(cmds):
+    """Huella de las entradas del build: comandos PyInstaller y (ruta, mtime, tamaño) de cada archivo"""
+    paths = ["requirements.txt", "jean_ejecutable_terminal.py", CREDENTIALS_FILE]
+    for root, dirs, files in os.walk("app"):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        paths.extend(os.path.join(root, name) for name in files)
+
+    digest = hashlib.sha256()
+    for cmd in cmds:
+        digest.update("\0".join(cmd).encode("utf-8") + b"\n")
+    for path in sorted(paths):
+        st = os.stat(path)
+        digest.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def pyinstaller_config_dir(variant):
+    """Caché persistente de PyInstaller para una variante construida en paralelo"""
+    # PyInstaller guarda ahí los binarios ya procesados (strip/UPX) por hash de contenido:
+    # si la carpeta sobrevive entre builds, no vuelve a comprimir DLLs/.so que no cambiaron
+    cache_root = os.environ.get("PYINSTALLER_CACHE_DIR") or os.path.expanduser("~/.cache/jeanacademy-pyinstaller")
+    config_dir = os.path.join(cache_root, variant["variant"])
+    os.makedirs(config_dir, exist_ok=True)
+    return config_dir
+
+def run_pyinstaller(cmd, config_dir=None):
+    """Ejecuta PyInstaller capturando la salida (se usa también desde procesos hijos)"""
+    # En paralelo cada build usa su propia caché de PyInstaller para no pisarse
+    env = {**os.environ, "PYINSTALLER_CONFIG_DIR": config_dir} if config_dir else None
+    subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
+
+def stream_pyinstaller(cmd):
+    """Ejecuta PyInstaller mostrando las líneas de progreso; devuelve el código de salida"""
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+
+    for line in process.stdout:
+        if PROGRESS_PATTERN.search(line):
+            print(f"   {line.strip()}")
+
+    return process.wait()
+
+def clone_file(src, dst):
+    """Copia un archivo clonándolo (copy-on-write) si el sistema de archivos lo permite"""
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst)
+
+def clone_or_copy(src, dst):
+    """Copia archivo o carpeta sin duplicar datos cuando se puede (clonefile en APFS, FICLONE en Linux)"""
+    if SYSTEM == "Darwin":
+        if subprocess.run(["cp", "-c", "-R", src, dst], capture_output=True).returncode == 0:
+            return
+        # cp -c falla si el volumen no es APFS: limpiar lo copiado a medias y copiar normal
+        if os.path.isdir(dst):
+            shutil.rmtree(dst)
+
+    if os.path.isdir(src):
+        shutil.copytree(src, dst, copy_function=clone_file)
+    else:
+        clone_file(src, dst)
+
+def link_or_copy(src, dst):
+    """Enlaza el archivo (hardlink) en dst; si no se puede (otro disco, FAT...), lo copia
+
+    Solo para artefactos del build (el ejecutable): dst comparte inodo con src, así que
+    editar uno cambia el otro. Lo que el usuario puede editar se copia con shutil.copy2.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        clone_or_copy(src, dst)
+
+def file_sha256(path):
+    """SHA-256 de un archivo leído por bloques"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def delivery_hashes(sources):
+    """Huellas de los archivos que van al paquete (los que no existen se ignoran)"""
+    return {path: file_sha256(path) for path in sorted(sources) if os.path.isfile(path)}
+
+def write_manifest(delivery_folder, hashes):
+    """Guarda las huellas del paquete para detectar la próxima vez que nada cambió"""
+    with open(os.path.join(delivery_folder, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump({"generated": BUILD_TIMESTAMP, "hashes": hashes}, f, indent=2)
+
+def write_zip(delivery_folder, zip_name):
+    """Escribe el ZIP de la carpeta: DEFLATE nivel 1 y sin recomprimir los binarios"""
+    with zipfile.ZipFile(zip_name, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for root, _, files in os.walk(delivery_folder):
+            # Por componentes de la ruta relativa: "my.apple/" no es un bundle
+            in_app_bundle = any(part.endswith(".app") for part in Path(os.path.relpath(root, delivery_folder)).parts)
+            for name in files:
+                path = os.path.join(root, name)
+                arcname = os.path.relpath(path, delivery_folder)
+                if in_app_bundle or name.lower().endswith(STORED_SUFFIXES):
+                    zf.write(path, arcname, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.write(path, arcname)
+
+class Builder:
+    """Construye el ejecutable de un target y arma el paquete ZIP de entrega"""
+
+    def __init__(self, target="native", debug=False, force_install=False):
+        self.target = target
+        self.config = TARGETS[target]
+        self.debug = debug
+        self.force_install = force_install
+        self.build_hash_file = os.path.join("build", f".jean_build_hash_{target}")
+
+    def check_requirements(self):
+        """Verifica que todo esté listo"""
+        print_step(f"VERIFICANDO REQUISITOS{self.config['label']}")
+
+        # Verificar Python
+        python_version = sys.version_info
+        print(f"✅ Python {python_version.major}.{python_version.minor}.{python_version.micro}")
+
+        # Verificar archivos esenciales
+        required_files = [
+            "jean_ejecutable_terminal.py",
+            "app/",
+            "requirements.txt",
+            CREDENTIALS_FILE
+        ]
+
+        # Una sola lectura del directorio en vez de un stat por archivo
+        entries = {entry.name: entry for entry in os.scandir(".")}
+
+        missing_files = []
+        for file in required_files:
+            entry = entries.get(file.rstrip("/"))
+            if entry is None or (file.endswith("/") and not entry.is_dir()):
+                missing_files.append(file)
+            else:
+                print(f"✅ {file}")
+
+        if missing_files:
+            print(f"❌ Archivos faltantes: {missing_files}")
+            print("💡 Asegúrate de tener todos los archivos del proyecto")
+            return False
+
+        return True
+
+    def install_dependencies(self):
+        """Instala dependencias necesarias (se omite si ya están instaladas, salvo force_install)"""
+        print_step("INSTALANDO DEPENDENCIAS")
+
+        if not self.force_install and dependencies_satisfied():
+            print("✅ Dependencias ya instaladas (cache hit), se omite pip")
+            print("💡 Usa --force-install para reinstalar")
+            return True
+
+        try:
+            install_cmd = pip_install_command()
+
+            # Instalar requirements
+            print("📦 Instalando dependencias del proyecto...")
+            subprocess.run([*install_cmd, "-r", "requirements.txt"], check=True)
+
+            # Instalar PyInstaller
+            print("📦 Instalando PyInstaller...")
+            subprocess.run([*install_cmd, "pyinstaller"], check=True)
+
+            print("✅ Todas las dependencias instaladas")
+            return True
+
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Error instalando dependencias: {e}")
+            return False
+
+    def executable_variants(self):
+        """Variantes a construir: la normal y, opcionalmente, una de depuración con consola"""
+        exe_name = self.config["exe_name"]
+        variants = [{"variant": "release", "exe_name": exe_name, "windowed_flag": self.config["windowed_flag"]}]
+        if self.debug:
+            variants.append({"variant": "debug", "exe_name": f"{exe_name}_debug", "windowed_flag": "--console"})
+        return variants
+
+    def pyinstaller_command(self, variant):
+        """Comando PyInstaller para una variante"""
+        return [
+            sys.executable, "-m", "PyInstaller",
+            "--onefile",           # Un solo archivo
+            variant["windowed_flag"],
+            "--name", variant["exe_name"],
+            "--add-data", f"app{os.pathsep}app",
+            "--add-data", f"{CREDENTIALS_FILE}{os.pathsep}.",
+            "--hidden-import", "pandas",
+            "--hidden-import", "xlsxwriter",
+            "--hidden-import", "google.oauth2.service_account",
+            "--hidden-import", "googleapiclient.discovery",
+            *self.config["extra_args"],
+            *(arg for module in EXCLUDED_MODULES for arg in ("--exclude-module", module)),
+            "--optimize", "2",     # Bytecode sin asserts ni docstrings (equivale a -OO)
+            "--distpath", self.config["distpath"],
+            "--noconfirm",         # No pedir confirmación
+            "jean_ejecutable_terminal.py"
+        ]
+
+    def executable_path(self, exe_name):
+        """Ruta del ejecutable construido (el .app en macOS si existe)"""
+        app_bundle = os.path.join(self.config["distpath"], f"{exe_name}.app")
+        if self.target == "native" and SYSTEM == "Darwin" and os.path.exists(app_bundle):
+            return app_bundle
+        return os.path.join(self.config["distpath"], f"{exe_name}{self.config['exe_extension']}")
+
+    def build_executable(self):
+        """Construye el ejecutable (y la variante de depuración si se pide)"""
+        print_step(f"CONSTRUYENDO EJECUTABLE{self.config['label']}")
+
+        variants = self.executable_variants()
+        exe_name = variants[0]["exe_name"]
+        cmds = [self.pyinstaller_command(variant) for variant in variants]
+
+        print(f"🖥️ Sistema detectado: {SYSTEM}")
+        print(f"📁 Nombre del ejecutable: {exe_name}{self.config['exe_extension']}")
+        if self.debug:
+            print(f"🐞 Variante de depuración: {variants[1]['exe_name']}")
+
+        # Sin cambios desde el último build: reutilizar los ejecutables existentes
+        inputs_hash = build_inputs_hash(cmds)
+        built = all(os.path.exists(self.executable_path(v["exe_name"])) for v in variants)
+        if built and os.path.exists(self.build_hash_file):
+            with open(self.build_hash_file, encoding="utf-8") as f:
+                if f.read().strip() == inputs_hash:
+                    print("✅ Sin cambios desde el último build, se reutiliza el ejecutable")
+                    return exe_name
+
+        try:
+            print("🔥 Ejecutando PyInstaller...")
+            print("⏳ Esto puede tomar varios minutos...")
+
+            if len(cmds) == 1:
+                # Una sola variante: en serie, con la caché por defecto de PyInstaller (también persistente)
+                if stream_pyinstaller(cmds[0]) != 0:
+                    print("❌ Error en la construcción del ejecutable")
+                    return None
+            else:
+                # Varias variantes: un proceso por variante
+                config_dirs = [pyinstaller_config_dir(v) for v in variants]
+                with ProcessPoolExecutor(max_workers=len(cmds)) as executor:
+                    list(executor.map(run_pyinstaller, cmds, config_dirs))
+
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Error construyendo ejecutable:")
+            print(f"Stdout: {e.stdout}")
+            print(f"Stderr: {e.stderr}")
+            return None
+        except Exception as e:
+            print(f"❌ Error construyendo ejecutable: {e}")
+            return None
+
+        # Guardar la huella para poder saltar el próximo build si nada cambia
+        os.makedirs("build", exist_ok=True)
+        with open(self.build_hash_file, "w", encoding="utf-8") as f:
+            f.write(inputs_hash)
+
+        print("✅ Ejecutable construido exitosamente!")
+        return exe_name
+
+    def delivery_sources(self, exe_name):
+        """Archivos de origen del paquete: ejecutable (o contenido del .app) y credenciales"""
+        exe_path = self.executable_path(exe_name)
+        if os.path.isdir(exe_path):
+            sources = [os.path.join(root, name) for root, _, files in os.walk(exe_path) for name in files]
+        else:
+            sources = [exe_path]
+        sources.append(CREDENTIALS_FILE)
+        return sources
+
+    def instructions_hash(self, exe_name):
+        """Huella de las instrucciones: plantilla y valores fijos (la fecha cambia en cada build)"""
+        template = "\0".join((self.config["instructions"], exe_name, SYSTEM))
+        return hashlib.sha256(template.encode("utf-8")).hexdigest()
+
+    def find_previous_delivery(self, hashes):
+        """Última carpeta de entrega con las mismas huellas y su ZIP ya creado, o None"""
+        folders = sorted(
+            entry.name for entry in os.scandir(".")
+            if entry.is_dir() and entry.name.startswith(self.config["delivery_prefix"])
+        )
+        if not folders:
+            return None
+
+        delivery_folder = folders[-1]
+        try:
+            with open(os.path.join(delivery_folder, MANIFEST_NAME), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if manifest.get("hashes") == hashes and os.path.exists(f"{delivery_folder}.zip"):
+            return delivery_folder
+        return None
+
+    def create_delivery_package(self, exe_name):
+        """Crea la carpeta de entrega con ejecutable, credenciales e instrucciones"""
+        print_step(f"CREANDO PAQUETE DE ENTREGA{self.config['label']}")
+
+        # Crear carpeta de entrega
+        delivery_folder = f"{self.config['delivery_prefix']}{BUILD_TIME.strftime('%Y%m%d_%H%M%S')}"
+
+        if os.path.exists(delivery_folder):
+            shutil.rmtree(delivery_folder)
+
+        os.makedirs(delivery_folder)
+        print(f"📁 Carpeta de entrega: {delivery_folder}")
+
+        # Copiar ejecutable (.app en macOS, archivo directo en Windows/Linux)
+        exe_path = self.executable_path(exe_name)
+        exe_file = os.path.basename(exe_path)
+        if os.path.isdir(exe_path):
+            clone_or_copy(exe_path, f"{delivery_folder}/{exe_file}")
+        elif os.path.exists(exe_path):
+            link_or_copy(exe_path, f"{delivery_folder}/{exe_file}")
+        else:
+            print(f"❌ No se encontró el ejecutable en {exe_path}")
+            return None
+        print(f"✅ Copiado: {exe_file}")
+
+        # Copiar credenciales: copia real, Jean puede editarlas o reemplazarlas en la entrega
+        if os.path.exists(CREDENTIALS_FILE):
+            shutil.copy2(CREDENTIALS_FILE, f"{delivery_folder}/{CREDENTIALS_FILE}")
+            print(f"✅ Copiado: {self.config['credentials_note']}")
+
+        # Crear instrucciones
+        instructions = self.config["instructions"].format(
+            exe_name=exe_name, system=SYSTEM, timestamp=BUILD_TIMESTAMP
+        )
+
+        with open(f"{delivery_folder}/{self.config['instructions_file']}", "w", encoding="utf-8") as f:
+            f.write(instructions)
+
+        print(f"✅ Creado: {self.config['instructions_file']}")
+
+        # Mostrar contenido final
+        print(f"\n📦 CONTENIDO DEL PAQUETE:")
+        for entry in os.scandir(delivery_folder):
+            if entry.is_file():
+                size_mb = entry.stat().st_size / (1024*1024)
+                print(f"   📄 {entry.name} ({size_mb:.1f} MB)")
+            else:
+                print(f"   📁 {entry.name}/")
+
+        return delivery_folder
+
+    def create_zip_package(self, delivery_folder):
+        """Crea ZIP para enviar por email"""
+        print_step(f"CREANDO ARCHIVO ZIP{self.config['label']}")
+
+        zip_name = f"{delivery_folder}.zip"
+
+        try:
+            write_zip(delivery_folder, zip_name)
+
+            if os.path.exists(zip_name):
+                size_mb = os.path.getsize(zip_name) / (1024*1024)
+                print(f"✅ ZIP creado: {zip_name}")
+                print(f"📏 Tamaño: {size_mb:.1f} MB")
+
+                if size_mb < 25:
+                    print("✅ Perfecto para email directo (< 25MB)")
+                elif size_mb < 100:
+                    print("⚠️ Usar Google Drive o WeTransfer (> 25MB)")
+                else:
+                    print("❌ Muy grande, considera optimizar")
+
+                return zip_name
+            else:
+                print("❌ Error creando ZIP")
+                return None
+
+        except Exception as e:
+            print(f"❌ Error creando ZIP: {e}")
+            return None
+
+    def run(self):
+        """Ejecuta todos los pasos: requisitos, dependencias, build, paquete y ZIP"""
+        config = self.config
+        print(config["banner"])
+        print("=" * 60)
+        print(f"🖥️ Sistema: {SYSTEM}")
+        print(f"📅 Fecha: {BUILD_TIMESTAMP}")
+
+        # Paso 1: Verificar requisitos
+        if not self.check_requirements():
+            print("\n❌ Faltan archivos necesarios. Abortando.")
+            return
+
+        # Paso 2: Instalar dependencias
+        if not self.install_dependencies():
+            print("\n❌ Error instalando dependencias. Abortando.")
+            return
+
+        # Paso 3: Construir ejecutable
+        exe_name = self.build_executable()
+        if not exe_name:
+            print("\n❌ Error construyendo ejecutable. Abortando.")
+            return
+
+        # Paso 4: Crear paquete de entrega (se reutiliza el anterior si nada cambió)
+        hashes = delivery_hashes(self.delivery_sources(exe_name))
+        hashes[self.config["instructions_file"]] = self.instructions_hash(exe_name)
+        delivery_folder = self.find_previous_delivery(hashes)
+        if delivery_folder:
+            print_step("REUTILIZANDO PAQUETE ANTERIOR")
+            print(f"✅ Sin cambios desde {delivery_folder}, se omiten paquete y ZIP")
+            zip_file = f"{delivery_folder}.zip"
+        else:
+            delivery_folder = self.create_delivery_package(exe_name)
+            if not delivery_folder:
+                print("\n❌ Error creando paquete. Abortando.")
+                return
+
+            # Paso 5: Crear ZIP
+            zip_file = self.create_zip_package(delivery_folder)
+            if zip_file:
+                write_manifest(delivery_folder, hashes)
+
+        # Resumen final
+        print_step(f"🎉 CONSTRUCCIÓN COMPLETADA{config['label']}")
+        print(f"✅ Ejecutable listo: {exe_name}{config['exe_extension']}")
+        print(f"✅ Carpeta de entrega: {delivery_folder}")
+        if zip_file:
+            print(f"✅ Archivo ZIP: {zip_file}")
+            print(f"\n📧 LISTO PARA ENVIAR A JEAN:")
+            print(f"   Adjuntar: {zip_file}")
+            print(f"   Asunto: '{config['email_subject']}'")
+
+        print(f"\n{config['notes_title']}")
+        for number, note in enumerate(config["notes"], start=1):
+            print(f"   {number}. {note}")
+        if config["closing"]:
+            print(f"\n{config['closing']}")
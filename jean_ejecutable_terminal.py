@@ -7,17 +7,130 @@ Interfaz completa con logs en tiempo real
 import os
 import sys
 import json
+import sqlite3
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, scrolledtext
+from contextlib import closing, suppress
 from datetime import datetime
 import threading
-import pandas as pd
-import subprocess
-import time
+import itertools
+import queue
+import functools
+
+# pandas, pyarrow, xlsxwriter, subprocess y el cliente de Drive se importan al usarlos:
+# la ventana aparece sin pagar su tiempo de carga
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el json estándar
+    orjson = None
 
 # Agregar path para imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Detección de estudiantes por nombre de archivo ("modulo_Nombre.jpg" -> "Nombre")
+STUDENT_TOKEN_PATTERN = r'^[^_]*_([^_]*)'
+IMAGE_EXT_PATTERN = r'\.(?:jpg|jpeg|png)'
+IMAGE_FILE_PATTERN = r'\.(?:jpe?g|png)$'
+
+# Columnas de la hoja 'Reporte de Entregas', en el orden de las filas de _process_module
+REPORT_COLUMNS = ('Módulo', 'Total Archivos', 'Archivos de Imagen', 'Estudiantes',
+                  'Lista Estudiantes', 'Última Actividad', 'Estado')
+MAX_COLUMN_WIDTH = 60
+
+# Líneas que conserva la terminal integrada
+MAX_TERMINAL_LINES = 5000
+
+def _dumps(obj, indent=False):
+    """Serializa a bytes UTF-8 (orjson si está disponible)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+@functools.lru_cache(maxsize=1)
+def _names_dtype():
+    """dtype de los nombres de archivo: strings de Arrow si pyarrow está instalado"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:  # pyarrow es opcional: sin él los nombres quedan como objetos Python
+        return object
+    # Los str.* corren en C sobre un buffer contiguo
+    return 'string[pyarrow]'
+
+
+def _display_name(file):
+    """displayName de lastModifyingUser, o None (sin crear un dict vacío por archivo)"""
+    user = file.get('lastModifyingUser')
+    return user.get('displayName') or None if user else None
+
+
+# Caché local de listados de carpetas. La firma de cada módulo combina el modifiedTime
+# de la carpeta con el del archivo más reciente dentro (Drive no siempre actualiza el de
+# la carpeta al subir o editar archivos). Un archivo borrado no cambia esa firma, así que
+# las entradas caducan a las CACHE_TTL_SECONDS y la opción "Ignorar caché" relee todo.
+CACHE_DB = 'jean_cache.db'
+CACHE_TTL_SECONDS = 6 * 3600
+
+
+def _cache_connect():
+    """Abre la base de la caché creando la tabla si no existe"""
+    conn = sqlite3.connect(CACHE_DB, timeout=10)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS folder_listing_cache (
+            id TEXT PRIMARY KEY,
+            signature TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            files BLOB NOT NULL
+        )
+    """)
+    return conn
+
+
+def listing_signatures(modules, latest_times):
+    """Firma por módulo: modifiedTime de la carpeta + el del archivo más reciente (sin firma si hubo error)"""
+    return {module['id']: f"{module.get('modifiedTime')}|{latest_times[module['id']]}"
+            for module in modules
+            if module['id'] in latest_times and not isinstance(latest_times[module['id']], Exception)}
+
+
+def load_cached_listings(signatures):
+    """Listados guardados de los módulos con la misma firma y dentro del TTL"""
+    min_fetched_at = time.time() - CACHE_TTL_SECONDS
+    try:
+        with closing(_cache_connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, signature, files FROM folder_listing_cache WHERE fetched_at >= ?",
+                (min_fetched_at,)
+            ).fetchall()
+    except sqlite3.Error:
+        return {}
+    return {folder_id: _loads(files) for folder_id, signature, files in rows
+            if signatures.get(folder_id) == signature}
+
+
+def store_cached_listings(signatures, listings):
+    """Guarda (UPSERT) los listados recién traídos de Drive junto a la firma de su módulo"""
+    fetched_at = time.time()
+    rows = [(folder_id, signatures[folder_id], fetched_at, _dumps(files))
+            for folder_id, files in listings.items()
+            if folder_id in signatures]
+    if not rows:
+        return
+    try:
+        with closing(_cache_connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO folder_listing_cache (id, signature, fetched_at, files) "
+                "VALUES (?, ?, ?, ?)", rows
+            )
+    except sqlite3.Error:
+        pass  # la caché es opcional: sin ella solo se vuelve a listar en la próxima ejecución
+
 class AcademiaJeanAppTerminal:
     def __init__(self):
         self.root = tk.Tk()
@@ -28,9 +141,22 @@ class AcademiaJeanAppTerminal:
         # Variables
         self.config = self.load_config()
         self.setup_environment()
+        self._creds = self.load_credentials()
+        
+        # Cliente de Drive y módulos del último rastreo, reutilizados entre rastreo y
+        # reporte; se invalidan al cambiar de carpeta. El cliente (httplib2 debajo) no es
+        # thread-safe: rastreo, reporte y CSV nunca corren a la vez (_set_actions_enabled)
+        self._client = None
+        self._modules = None
+        self._client_lock = threading.Lock()
+        
+        # Cola productor-consumidor: los hilos de trabajo solo encolan; el hilo de Tk
+        # la vacía cada 50 ms (Tkinter no es thread-safe)
+        self._log_queue = queue.Queue()
         
         # Crear interfaz
         self.create_interface()
+        self.root.after(50, self._pump_queue)
         
         # Centrar ventana
         self.center_window()
@@ -53,8 +179,8 @@ class AcademiaJeanAppTerminal:
         
         if os.path.exists(config_file):
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    saved_config = json.load(f)
+                with open(config_file, 'rb') as f:
+                    saved_config = _loads(f.read())
                     default_config.update(saved_config)
             except:
                 pass
@@ -64,8 +190,8 @@ class AcademiaJeanAppTerminal:
     def save_config(self):
         """Guarda configuración"""
         try:
-            with open('jean_config.json', 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            with open('jean_config.json', 'wb') as f:
+                f.write(_dumps(self.config, indent=True))
         except Exception as e:
             self.log(f"❌ Error guardando configuración: {e}")
     
@@ -74,6 +200,28 @@ class AcademiaJeanAppTerminal:
         os.environ['GOOGLE_SERVICE_ACCOUNT_JSON_PATH'] = self.config['google_credentials_file']
         os.environ['DRIVE_FOLDER_ID'] = self.config['drive_folder_id']
     
+    def _get_client(self):
+        """Cliente de Google Drive, creado (y autenticado) una sola vez"""
+        with self._client_lock:
+            if self._client is None:
+                self.log("📂 Importando cliente de Google Drive...")
+                from app.ingest.drive_client import GoogleDriveClient
+                
+                self.log("🔐 Autenticando con Google Drive...")
+                self._client = GoogleDriveClient(creds=self._creds)
+            return self._client
+    
+    def load_credentials(self):
+        """Lee una sola vez el JSON del service account; None si falta o no es válido"""
+        try:
+            from google.oauth2 import service_account
+            return service_account.Credentials.from_service_account_file(
+                self.config['google_credentials_file'],
+                scopes=['https://www.googleapis.com/auth/drive.readonly']
+            )
+        except Exception:
+            return None
+    
     def center_window(self):
         """Centra la ventana en la pantalla"""
         self.root.update_idletasks()
@@ -84,16 +232,46 @@ class AcademiaJeanAppTerminal:
         self.root.geometry(f"{width}x{height}+{x}+{y}")
     
     def log(self, message):
-        """Agregar mensaje a la terminal"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_line = f"[{timestamp}] {message}\\n"
-        
-        # Agregar al final y hacer scroll automático
-        self.terminal.insert(tk.END, log_line)
-        self.terminal.see(tk.END)
-        
-        # Actualizar interfaz
-        self.root.update_idletasks()
+        """Agregar mensaje a la terminal (seguro desde cualquier hilo)"""
+        timestamp = time.strftime("%H:%M:%S")
+        self._log_queue.put(('log', f"[{timestamp}] {message}\n"))
+    
+    def _post(self, callback, *args):
+        """Ejecuta callback(*args) en el hilo de Tk desde un hilo de trabajo"""
+        self._log_queue.put(('call', (callback, args)))
+    
+    def _pump_queue(self):
+        """Vacía la cola en el hilo de Tk: líneas en un solo insert y callbacks en orden"""
+        lineas = []
+        while True:
+            try:
+                kind, payload = self._log_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'log':
+                lineas.append(payload)
+                continue
+            
+            # Antes de un callback se vuelcan las líneas previas para conservar el orden
+            self._insert_lines(lineas)
+            lineas = []
+            callback, args = payload
+            callback(*args)
+        
+        self._insert_lines(lineas)
+        self.root.after(50, self._pump_queue)
+    
+    def _insert_lines(self, lineas):
+        """Agrega las líneas al final, recorta las más antiguas y hace scroll automático"""
+        if lineas:
+            self.terminal.insert(tk.END, ''.join(lineas))
+            
+            # Como mucho MAX_TERMINAL_LINES líneas: el widget no crece sin límite
+            total = int(self.terminal.index('end-1c').split('.')[0])
+            if total > MAX_TERMINAL_LINES:
+                self.terminal.delete('1.0', f'{total - MAX_TERMINAL_LINES}.0')
+            self.terminal.see(tk.END)
     
     def clear_terminal(self):
         """Limpiar terminal"""
@@ -207,10 +385,31 @@ class AcademiaJeanAppTerminal:
         )
         self.report_button.grid(row=0, column=1, sticky="ew", padx=(5, 0), pady=(0, 10))
         
+        # Botón 3: CSV rápido (solo la tabla de entregas, sin Excel)
+        self.csv_button = tk.Button(
+            buttons_grid,
+            text="⚡ GENERAR CSV RÁPIDO",
+            command=self.generate_csv_threaded,
+            bg="#0F766E",
+            fg="white",
+            font=("Arial", 10, "bold"),
+            relief=tk.FLAT
+        )
+        self.csv_button.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(0, 5))
+        
         # Configurar grid
         buttons_grid.columnconfigure(0, weight=1)
         buttons_grid.columnconfigure(1, weight=1)
         
+        # Ignorar la caché local de listados (releer todos los módulos desde Drive)
+        self.refresh_var = tk.BooleanVar(value=False)
+        refresh_check = ttk.Checkbutton(
+            buttons_grid,
+            text="♻️ Ignorar caché (leer todo desde Drive)",
+            variable=self.refresh_var
+        )
+        refresh_check.grid(row=2, column=0, columnspan=2, pady=(5, 0))
+        
         # Botón limpiar terminal
         clear_btn = tk.Button(
             buttons_grid,
@@ -221,7 +420,7 @@ class AcademiaJeanAppTerminal:
             font=("Arial", 9),
             relief=tk.FLAT
         )
-        clear_btn.grid(row=1, column=0, columnspan=2, pady=(5, 0))
+        clear_btn.grid(row=3, column=0, columnspan=2, pady=(5, 0))
         
         # ========== PANEL INFERIOR - TERMINAL ==========
         terminal_frame = ttk.LabelFrame(main_frame, text="📟 Terminal - Progreso en Tiempo Real", padding="5")
@@ -235,7 +434,8 @@ class AcademiaJeanAppTerminal:
             bg="#1a1a1a",
             fg="#00ff00",
             insertbackground="#00ff00",
-            wrap=tk.WORD
+            wrap=tk.WORD,
+            undo=False  # sin pila de deshacer para la salida del log
         )
         self.terminal.pack(fill=tk.BOTH, expand=True)
         
@@ -244,7 +444,7 @@ class AcademiaJeanAppTerminal:
         status_frame.pack(fill=tk.X)
         
         # Estado de credenciales
-        cred_status = "✅ Credenciales OK" if os.path.exists(self.config['google_credentials_file']) else "⚠️ Verificar credenciales"
+        cred_status = "✅ Credenciales OK" if self._creds is not None else "⚠️ Verificar credenciales"
         self.status_label = tk.Label(
             status_frame,
             text=f"Estado: {cred_status} | Usuario: {self.config['user_name']}",
@@ -281,6 +481,11 @@ ID:  1ABC123XYZ"""
             self.setup_environment()
             self.save_config()
             
+            # El cliente apunta a la carpeta anterior
+            with self._client_lock:
+                self._client = None
+                self._modules = None
+            
             self.log(f"✅ Carpeta actualizada:")
             self.log(f"   Anterior: {old_id}...")
             self.log(f"   Nueva: {new_id.strip()[:30]}...")
@@ -324,23 +529,28 @@ Tu Carpeta/
         
         messagebox.showinfo("Ayuda - ID de Carpeta Google Drive", help_text)
     
+    def _set_actions_enabled(self, enabled):
+        """Habilita o deshabilita rastreo, reporte y CSV juntos: solo una acción a la vez"""
+        state = tk.NORMAL if enabled else tk.DISABLED
+        for button in (self.scan_button, self.report_button, self.csv_button):
+            button.config(state=state)
+    
     def scan_drive_threaded(self):
         """Inicia rastreo en hilo separado"""
-        self.scan_button.config(state=tk.DISABLED, text="🔄 RASTREANDO...")
+        self._set_actions_enabled(False)
+        self.scan_button.config(text="🔄 RASTREANDO...")
         self.log("🔍 Iniciando rastreo de Google Drive...")
         threading.Thread(target=self.scan_drive, daemon=True).start()
     
     def scan_drive(self):
         """Escanea Google Drive con logs detallados"""
         try:
-            self.log("📂 Importando cliente de Google Drive...")
-            from app.ingest.drive_client import GoogleDriveClient
-            
-            self.log("🔐 Autenticando con Google Drive...")
-            client = GoogleDriveClient()
+            client = self._get_client()
             
             self.log("📁 Obteniendo lista de módulos...")
             modules = client.list_folders_in_root()
+            with self._client_lock:
+                self._modules = modules
             
             self.log(f"✅ Rastreo completado exitosamente!")
             self.log(f"📊 RESULTADOS:")
@@ -357,17 +567,18 @@ Tu Carpeta/
                 self.log(f"   ... y {len(modules) - 5} módulos más")
             
             # Actualizar interfaz en hilo principal
-            self.root.after(0, lambda: self.scan_completed(len(modules)))
+            self._post(self.scan_completed, len(modules))
             
         except Exception as e:
             error_msg = str(e)
             self.log(f"❌ ERROR durante el rastreo:")
             self.log(f"   {error_msg[:100]}...")
-            self.root.after(0, lambda: self.scan_error(error_msg))
+            self._post(self.scan_error, error_msg)
     
     def scan_completed(self, module_count):
         """Callback cuando el rastreo termina"""
-        self.scan_button.config(state=tk.NORMAL, text="🔍 1. RASTREAR GOOGLE DRIVE")
+        self._set_actions_enabled(True)
+        self.scan_button.config(text="🔍 1. RASTREAR GOOGLE DRIVE")
         
         messagebox.showinfo(
             "🎉 Rastreo Completado",
@@ -381,7 +592,8 @@ Tu Carpeta/
     
     def scan_error(self, error):
         """Callback cuando hay error en rastreo"""
-        self.scan_button.config(state=tk.NORMAL, text="🔍 1. RASTREAR GOOGLE DRIVE")
+        self._set_actions_enabled(True)
+        self.scan_button.config(text="🔍 1. RASTREAR GOOGLE DRIVE")
         
         messagebox.showerror(
             "❌ Error de Conexión",
@@ -395,161 +607,310 @@ Tu Carpeta/
     
     def generate_report_threaded(self):
         """Inicia generación de reporte en hilo separado"""
-        self.report_button.config(state=tk.DISABLED, text="📊 GENERANDO...")
+        self._set_actions_enabled(False)
+        self.report_button.config(text="📊 GENERANDO...")
         self.log("📊 Iniciando generación de reporte Excel...")
-        threading.Thread(target=self.generate_report, daemon=True).start()
+        threading.Thread(target=self.generate_report, args=(self.refresh_var.get(),), daemon=True).start()
     
-    def generate_report(self):
-        """Genera reporte con logs detallados"""
+    def generate_report(self, refresh=False):
+        """Genera reporte con logs detallados (refresh: ignorar la caché de listados)"""
         try:
-            self.log("📂 Importando cliente de Google Drive...")
-            from app.ingest.drive_client import GoogleDriveClient
-            
-            self.log("🔐 Conectando a Google Drive...")
-            client = GoogleDriveClient()
+            self.log("📄 Creando archivo Excel...")
             
-            self.log("📁 Obteniendo lista de módulos...")
-            modules = client.list_folders_in_root()
-            self.log(f"   ✅ {len(modules)} módulos encontrados")
+            # Crear Excel
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"reporte_academia_jean_{timestamp}.xlsx"
             
-            self.log("🔍 Analizando archivos en cada módulo...")
+            import xlsxwriter
             
-            # Procesar módulos
-            datos_entregas = []
-            total_archivos = 0
-            estudiantes_unicos = set()
+            # Se escribe con nombre temporal y se renombra solo si todo salió bien: ante un
+            # error no queda un .xlsx truncado con el nombre final
+            tmp_filename = filename + '.tmp'
             
-            for i, module in enumerate(modules, 1):
-                self.log(f"   📁 {i}/{len(modules)} - Procesando: {module['name']}")
-                
+            # xlsxwriter directo en modo constant_memory: cada fila se vuelca a disco al
+            # pasar a la siguiente, así que las hojas se escriben de arriba a abajo
+            workbook = xlsxwriter.Workbook(tmp_filename, {'constant_memory': True})
+            try:
                 try:
-                    files = client.list_files_in_folder(module['id'])
-                    archivos_img = [f for f in files if f['name'].lower().endswith(('.jpg', '.jpeg', '.png'))]
+                    header_format = workbook.add_format({
+                        'bold': True,
+                        'bg_color': '#1E3A8A',
+                        'font_color': 'white',
+                        'border': 1
+                    })
                     
-                    # Detectar estudiantes
-                    estudiantes_modulo = set()
-                    for file in files:
-                        # Por metadata
-                        if file.get('lastModifyingUser', {}).get('displayName'):
-                            nombre = file['lastModifyingUser']['displayName']
-                            estudiantes_modulo.add(nombre)
-                            estudiantes_unicos.add(nombre)
-                        
-                        # Por nombre de archivo
-                        nombre_archivo = file['name']
-                        if '_' in nombre_archivo:
-                            partes = nombre_archivo.split('_')
-                            if len(partes) >= 2:
-                                posible_nombre = partes[1].replace('.jpg', '').replace('.jpeg', '').replace('.png', '')
-                                if len(posible_nombre) > 2 and not posible_nombre.isdigit():
-                                    estudiantes_modulo.add(posible_nombre)
-                                    estudiantes_unicos.add(posible_nombre)
+                    # Hoja principal: un hilo escritor la va llenando mientras siguen llegando
+                    # listados de Drive; las filas se le pasan en el orden original de los módulos
+                    writer_q = queue.Queue(maxsize=256)
+                    writer_errors = []
+                    writer = threading.Thread(
+                        target=self._excel_writer_worker,
+                        args=(workbook, 'Reporte de Entregas', header_format, writer_q, writer_errors),
+                        daemon=True
+                    )
+                    writer.start()
+                    try:
+                        filas, total_archivos, estudiantes_unicos = self._collect_report_data(on_row=writer_q.put, refresh=refresh)
+                    finally:
+                        writer_q.put(None)
+                        writer.join()
                     
-                    self.log(f"      📊 {len(files)} archivos, {len(estudiantes_modulo)} estudiantes")
+                    if writer_errors:
+                        raise writer_errors[0]
+                    self.log("   ✅ Hoja 'Reporte de Entregas' creada")
                     
-                    datos_entregas.append({
-                        'Módulo': module['name'],
-                        'Total Archivos': len(files),
-                        'Archivos de Imagen': len(archivos_img),
-                        'Estudiantes': len(estudiantes_modulo),
-                        'Lista Estudiantes': ', '.join(list(estudiantes_modulo)[:3]) + ('...' if len(estudiantes_modulo) > 3 else ''),
-                        'Última Actividad': files[0]['modifiedTime'][:10] if files else 'Sin archivos',
-                        'Estado': '✅ Con entregas' if len(files) > 0 else '⚠️ Sin entregas'
-                    })
+                    _, resumen, estudiantes_df = self._build_dataframes(filas, total_archivos, estudiantes_unicos)
                     
-                    total_archivos += len(files)
+                    # Hoja resumen
+                    self._write_sheet(workbook, 'Resumen Ejecutivo', resumen, header_format)
+                    self.log("   ✅ Hoja 'Resumen Ejecutivo' creada")
                     
-                except Exception as e:
-                    self.log(f"      ⚠️ Error procesando módulo: {str(e)[:50]}...")
-                    datos_entregas.append({
-                        'Módulo': module['name'],
-                        'Total Archivos': 0,
-                        'Archivos de Imagen': 0,
-                        'Estudiantes': 0,
-                        'Lista Estudiantes': 'Error de acceso',
-                        'Última Actividad': 'Error',
-                        'Estado': '❌ Error'
-                    })
-                
-                # Pequeña pausa para no sobrecargar la API
-                time.sleep(0.1)
+                    # Lista de estudiantes
+                    if len(estudiantes_df):
+                        self._write_sheet(workbook, 'Lista de Estudiantes', estudiantes_df, header_format)
+                        self.log("   ✅ Hoja 'Lista de Estudiantes' creada")
+                finally:
+                    workbook.close()
+            except BaseException:
+                with suppress(OSError):
+                    os.remove(tmp_filename)
+                raise
+            os.replace(tmp_filename, filename)
             
-            self.log("📄 Creando archivo Excel...")
+            self.log("✅ REPORTE EXCEL GENERADO EXITOSAMENTE!")
+            result = self._report_result(filename, filas, total_archivos, estudiantes_unicos)
+            self._post(self.report_completed, result)
+            
+        except Exception as e:
+            error_msg = str(e)
+            self.log(f"❌ ERROR generando reporte:")
+            self.log(f"   {error_msg[:100]}...")
+            self._post(self.report_error, error_msg)
+    
+    def generate_csv_threaded(self):
+        """Inicia generación del CSV en hilo separado"""
+        self._set_actions_enabled(False)
+        self.csv_button.config(text="⚡ GENERANDO...")
+        self.log("⚡ Iniciando generación de CSV rápido...")
+        threading.Thread(target=self.generate_csv, args=(self.refresh_var.get(),), daemon=True).start()
+    
+    def generate_csv(self, refresh=False):
+        """Genera solo la tabla de entregas en CSV, sin pasar por la serialización de Excel"""
+        try:
+            filas, total_archivos, estudiantes_unicos = self._collect_report_data(refresh=refresh)
+            entregas, _, _ = self._build_dataframes(filas, total_archivos, estudiantes_unicos)
             
-            # Crear Excel
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"reporte_academia_jean_{timestamp}.xlsx"
+            filename = f"reporte_academia_jean_{timestamp}.csv"
             
-            with pd.ExcelWriter(filename, engine='xlsxwriter') as writer:
-                # Hoja principal
-                df = pd.DataFrame(datos_entregas)
-                df.to_excel(writer, sheet_name='Reporte de Entregas', index=False)
-                self.log("   ✅ Hoja 'Reporte de Entregas' creada")
-                
-                # Hoja resumen
-                modulos_activos = len([d for d in datos_entregas if d['Total Archivos'] > 0])
-                resumen = pd.DataFrame([
-                    {'Información': 'Academia', 'Valor': self.config['academy_name']},
-                    {'Información': 'Generado por', 'Valor': self.config['user_name']},
-                    {'Información': 'Fecha', 'Valor': datetime.now().strftime('%Y-%m-%d %H:%M:%S')},
-                    {'Información': 'Total Módulos', 'Valor': len(datos_entregas)},
-                    {'Información': 'Módulos Activos', 'Valor': modulos_activos},
-                    {'Información': 'Total Archivos', 'Valor': total_archivos},
-                    {'Información': 'Estudiantes Únicos', 'Valor': len(estudiantes_unicos)},
-                ])
-                resumen.to_excel(writer, sheet_name='Resumen Ejecutivo', index=False)
-                self.log("   ✅ Hoja 'Resumen Ejecutivo' creada")
+            # utf-8-sig: Excel reconoce la codificación al abrir el archivo (acentos y emojis)
+            self.log("📄 Escribiendo archivo CSV...")
+            entregas.to_csv(filename, index=False, encoding='utf-8-sig')
+            
+            self.log("✅ CSV GENERADO EXITOSAMENTE!")
+            result = self._report_result(filename, filas, total_archivos, estudiantes_unicos)
+            self._post(self.csv_completed, result)
+            
+        except Exception as e:
+            error_msg = str(e)
+            self.log(f"❌ ERROR generando CSV:")
+            self.log(f"   {error_msg[:100]}...")
+            self._post(self.csv_error, error_msg)
+    
+    def _collect_report_data(self, on_row=None, refresh=False):
+        """
+        Lista y procesa todos los módulos.
+        
+        Devuelve (filas en el orden original de los módulos, total de archivos,
+        estudiantes únicos). on_row, si se pasa, recibe cada fila en ese mismo orden
+        en cuanto ella y las anteriores están listas. Con refresh=True no se lee la
+        caché local (pero se actualiza con lo listado).
+        """
+        client = self._get_client()
+        
+        # La lista del rastreo previo se usa una sola vez; sin rastreo se pide a Drive
+        with self._client_lock:
+            modules, self._modules = self._modules, None
+        if modules is None:
+            self.log("📁 Obteniendo lista de módulos...")
+            modules = client.list_folders_in_root()
+        self.log(f"   ✅ {len(modules)} módulos encontrados")
+        
+        self.log("🔍 Analizando archivos en cada módulo...")
+        
+        # Listados en batch; cada módulo se procesa en cuanto llega su batch
+        modulos_por_id = {module['id']: module for module in modules}
+        orden = list(modulos_por_id)
+        filas_por_modulo = {}
+        total_archivos = 0
+        estudiantes_unicos = set()
+        
+        # Módulos sin cambios desde la última ejecución: listado desde la caché local
+        firmas = listing_signatures(modules, client.latest_modified_times(orden))
+        cacheados = {} if refresh else load_cached_listings(firmas)
+        pendientes = [folder_id for folder_id in orden if folder_id not in cacheados]
+        if cacheados:
+            self.log(f"   💾 {len(cacheados)} módulos sin cambios (caché local), {len(pendientes)} a listar")
+        
+        nuevos = {}
+        siguiente = 0
+        listados = itertools.chain(cacheados.items(), client.iter_files_in_folders(pendientes))
+        for i, (folder_id, files) in enumerate(listados, 1):
+            module = modulos_por_id[folder_id]
+            if folder_id not in cacheados and not isinstance(files, Exception):
+                nuevos[folder_id] = files
+            self.log(f"   📁 {i}/{len(orden)} - Procesando: {module['name']}")
+            
+            fila, archivos_modulo, estudiantes_modulo = self._process_module(module, files)
+            filas_por_modulo[folder_id] = fila
+            total_archivos += archivos_modulo
+            estudiantes_unicos |= estudiantes_modulo
+            
+            while siguiente < len(orden) and orden[siguiente] in filas_por_modulo:
+                if on_row is not None:
+                    on_row(filas_por_modulo[orden[siguiente]])
+                siguiente += 1
+        
+        store_cached_listings(firmas, nuevos)
+        
+        filas = [filas_por_modulo[folder_id] for folder_id in orden]
+        return filas, total_archivos, estudiantes_unicos
+    
+    def _build_dataframes(self, filas, total_archivos, estudiantes_unicos):
+        """DataFrames de entregas, resumen y estudiantes, construidos columna a columna"""
+        import pandas as pd
+        
+        # pandas construye cada columna como un único array tipado
+        entregas = pd.DataFrame({
+            columna: [fila[i] for fila in filas]
+            for i, columna in enumerate(REPORT_COLUMNS)
+        })
+        
+        modulos_activos = sum(1 for fila in filas if fila[1] > 0)
+        resumen = pd.DataFrame({
+            'Información': ['Academia', 'Generado por', 'Fecha', 'Total Módulos',
+                            'Módulos Activos', 'Total Archivos', 'Estudiantes Únicos'],
+            'Valor': [self.config['academy_name'], self.config['user_name'],
+                      datetime.now().strftime('%Y-%m-%d %H:%M:%S'), len(filas),
+                      modulos_activos, total_archivos, len(estudiantes_unicos)],
+        })
+        
+        # Orden con el sort de NumPy en vez de sorted() en Python
+        estudiantes = pd.Series(list(estudiantes_unicos), dtype=object)
+        estudiantes_df = pd.DataFrame({
+            'Estudiante': estudiantes.sort_values().reset_index(drop=True)
+        })
+        return entregas, resumen, estudiantes_df
+    
+    def _report_result(self, filename, filas, total_archivos, estudiantes_unicos):
+        """Registra las estadísticas finales y arma el resultado para la interfaz"""
+        modulos_activos = sum(1 for fila in filas if fila[1] > 0)
+        
+        self.log(f"📁 Archivo: {filename}")
+        self.log(f"📊 ESTADÍSTICAS FINALES:")
+        self.log(f"   • Módulos analizados: {len(filas)}")
+        self.log(f"   • Módulos con entregas: {modulos_activos}")
+        self.log(f"   • Archivos procesados: {total_archivos}")
+        self.log(f"   • Estudiantes únicos: {len(estudiantes_unicos)}")
+        
+        return {
+            'filename': filename,
+            'modules': len(filas),
+            'active_modules': modulos_activos,
+            'files': total_archivos,
+            'students': len(estudiantes_unicos)
+        }
+    
+
+    def _excel_writer_worker(self, workbook, sheet_name, header_format, writer_q, writer_errors):
+        """Hilo escritor: vuelca a la hoja las filas que llegan por la cola hasta recibir None"""
+        worksheet = workbook.add_worksheet(sheet_name)
+        widths = [len(column) for column in REPORT_COLUMNS]
+        row_num = 0
+        try:
+            worksheet.write_row(0, 0, REPORT_COLUMNS, header_format)
+        except Exception as e:
+            writer_errors.append(e)
+        
+        while True:
+            fila = writer_q.get()
+            if fila is None:
+                break
+            if writer_errors:
+                continue  # se sigue vaciando la cola para no bloquear al productor
+            try:
+                row_num += 1
+                worksheet.write_row(row_num, 0, fila)
+                widths = [max(width, len(str(value))) for width, value in zip(widths, fila)]
+            except Exception as e:
+                writer_errors.append(e)
+        
+        for col_num, width in enumerate(widths):
+            worksheet.set_column(col_num, col_num, min(width + 2, MAX_COLUMN_WIDTH))
+    
+    def _write_sheet(self, workbook, sheet_name, df, header_format):
+        """Escribe un DataFrame como hoja: encabezado con formato, filas con write_row y anchos precalculados"""
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, list(df.columns), header_format)
+        for row_num, row in enumerate(df.itertuples(index=False), 1):
+            worksheet.write_row(row_num, 0, row)
+        
+        # autofit() no funciona en constant_memory: el ancho sale del texto más largo de
+        # cada columna (una pasada vectorizada por columna), con tope para textos largos
+        for col_num, column in enumerate(df.columns):
+            width = len(str(column))
+            if len(df):
+                width = max(width, int(df[column].astype(str).str.len().max()))
+            worksheet.set_column(col_num, col_num, min(width + 2, MAX_COLUMN_WIDTH))
+    
+    def _process_module(self, module, files):
+        """Fila del reporte (tupla en el orden de REPORT_COLUMNS), número de archivos y estudiantes de un módulo (files puede ser la excepción del listado)"""
+        import pandas as pd
+        
+        try:
+            if isinstance(files, Exception):
+                raise files
+            # Detectar estudiantes: una pasada vectorizada (regex en C) sobre todos los nombres
+            archivos_img = 0
+            estudiantes_modulo = set()
+            if files:
+                nombres = pd.Series([f['name'] for f in files], dtype=_names_dtype())
+                archivos_img = int(nombres.str.contains(IMAGE_FILE_PATTERN, case=False).sum())
                 
-                # Lista de estudiantes
-                if estudiantes_unicos:
-                    estudiantes_df = pd.DataFrame([
-                        {'Estudiante': estudiante} for estudiante in sorted(estudiantes_unicos)
-                    ])
-                    estudiantes_df.to_excel(writer, sheet_name='Lista de Estudiantes', index=False)
-                    self.log("   ✅ Hoja 'Lista de Estudiantes' creada")
+                # Por nombre de archivo: segundo token separado por '_', sin extensión de imagen
+                posibles = nombres.str.extract(STUDENT_TOKEN_PATTERN, expand=False).dropna()
+                posibles = posibles.str.replace(IMAGE_EXT_PATTERN, '', regex=True)
+                posibles = posibles[(posibles.str.len() > 2) & ~posibles.str.isdigit()]
                 
-                # Formatear
-                workbook = writer.book
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'bg_color': '#1E3A8A',
-                    'font_color': 'white',
-                    'border': 1
-                })
+                # Por metadata
+                usuarios = pd.Series([_display_name(f) for f in files], dtype=object)
                 
-                for sheet_name in ['Reporte de Entregas', 'Resumen Ejecutivo', 'Lista de Estudiantes']:
-                    if sheet_name in writer.sheets:
-                        worksheet = writer.sheets[sheet_name]
-                        worksheet.autofit()
+                estudiantes_modulo = set(pd.concat([usuarios, posibles]).dropna().unique())
             
-            self.log("✅ REPORTE EXCEL GENERADO EXITOSAMENTE!")
-            self.log(f"📁 Archivo: {filename}")
-            self.log(f"📊 ESTADÍSTICAS FINALES:")
-            self.log(f"   • Módulos analizados: {len(datos_entregas)}")
-            self.log(f"   • Módulos con entregas: {modulos_activos}")
-            self.log(f"   • Archivos procesados: {total_archivos}")
-            self.log(f"   • Estudiantes únicos: {len(estudiantes_unicos)}")
+            self.log(f"      📊 {len(files)} archivos, {len(estudiantes_modulo)} estudiantes")
             
-            # Actualizar interfaz
-            result = {
-                'filename': filename,
-                'modules': len(datos_entregas),
-                'active_modules': modulos_activos,
-                'files': total_archivos,
-                'students': len(estudiantes_unicos)
-            }
+            lista_estudiantes = list(estudiantes_modulo)
             
-            self.root.after(0, lambda: self.report_completed(result))
+            fila = (
+                module['name'],
+                len(files),
+                archivos_img,
+                len(estudiantes_modulo),
+                ', '.join(lista_estudiantes[:3]) + ('...' if len(lista_estudiantes) > 3 else ''),
+                files[0]['modifiedTime'][:10] if files else 'Sin archivos',
+                '✅ Con entregas' if len(files) > 0 else '⚠️ Sin entregas'
+            )
+            return fila, len(files), estudiantes_modulo
             
         except Exception as e:
-            error_msg = str(e)
-            self.log(f"❌ ERROR generando reporte:")
-            self.log(f"   {error_msg[:100]}...")
-            self.root.after(0, lambda: self.report_error(error_msg))
+            self.log(f"      ⚠️ Error procesando módulo: {str(e)[:50]}...")
+            fila = (module['name'], 0, 0, 0, 'Error de acceso', 'Error', '❌ Error')
+            return fila, 0, set()
     
     def report_completed(self, result):
         """Callback cuando el reporte termina"""
-        self.report_button.config(state=tk.NORMAL, text="📊 2. GENERAR REPORTE EXCEL")
+        self._set_actions_enabled(True)
+        self.report_button.config(text="📊 2. GENERAR REPORTE EXCEL")
         
         message = f"""✅ REPORTE EXCEL GENERADO EXITOSAMENTE
         
@@ -569,20 +930,27 @@ Tu Carpeta/
 ¿Quieres abrir el archivo Excel ahora?"""
         
         if messagebox.askyesno("🎉 Reporte Completado", message):
+            import subprocess
+            
             try:
                 if os.name == 'nt':  # Windows
                     os.startfile(result['filename'])
                     self.log(f"📂 Abriendo archivo en Windows...")
-                else:  # macOS
-                    subprocess.run(['open', result['filename']])
+                elif sys.platform == 'darwin':  # macOS
+                    # Popen sin esperar: la interfaz no se bloquea mientras 'open' responde
+                    subprocess.Popen(['open', result['filename']])
                     self.log(f"📂 Abriendo archivo en macOS...")
+                else:  # Linux / WSL
+                    subprocess.Popen(['xdg-open', result['filename']])
+                    self.log(f"📂 Abriendo archivo en Linux...")
             except Exception as e:
                 self.log(f"⚠️ No se pudo abrir automáticamente: {e}")
                 messagebox.showinfo("Información", f"Abre manualmente: {result['filename']}")
     
     def report_error(self, error):
         """Callback cuando hay error en reporte"""
-        self.report_button.config(state=tk.NORMAL, text="📊 2. GENERAR REPORTE EXCEL")
+        self._set_actions_enabled(True)
+        self.report_button.config(text="📊 2. GENERAR REPORTE EXCEL")
         
         messagebox.showerror(
             "❌ Error Generando Reporte",
@@ -594,6 +962,33 @@ Tu Carpeta/
             f"• Revisa el terminal para más detalles"
         )
     
+    def csv_completed(self, result):
+        """Callback cuando el CSV termina"""
+        self._set_actions_enabled(True)
+        self.csv_button.config(text="⚡ GENERAR CSV RÁPIDO")
+        
+        messagebox.showinfo(
+            "🎉 CSV Completado",
+            f"✅ CSV GENERADO EXITOSAMENTE\n\n"
+            f"📁 Archivo: {result['filename']}\n\n"
+            f"• {result['modules']} módulos analizados\n"
+            f"• {result['active_modules']} módulos con entregas\n"
+            f"• {result['files']} archivos procesados\n"
+            f"• {result['students']} estudiantes únicos detectados"
+        )
+    
+    def csv_error(self, error):
+        """Callback cuando hay error en el CSV"""
+        self._set_actions_enabled(True)
+        self.csv_button.config(text="⚡ GENERAR CSV RÁPIDO")
+        
+        messagebox.showerror(
+            "❌ Error Generando CSV",
+            f"No se pudo generar el CSV:\n\n"
+            f"Error: {error[:150]}...\n\n"
+            f"💡 Revisa el terminal para más detalles"
+        )
+    
     def run(self):
         """Ejecuta la aplicación"""
         self.root.mainloop()